@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'rest_framework',
+    'channels',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
     'drf_yasg',
@@ -69,6 +70,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
+    'hunspell.middleware.RequestProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -90,6 +92,14 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'core.wsgi.application'
+ASGI_APPLICATION = 'core.asgi.application'
+
+# Channel layer for the live-check WebSocket; in-memory works with a single process per client connection
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    },
+}
 
 
 # Database
@@ -232,4 +242,168 @@ CSRF_TRUSTED_ORIGINS = [
 CSRF_COOKIE_SECURE = not DEBUG
 SESSION_COOKIE_SECURE = not DEBUG
 CSRF_COOKIE_SAMESITE = 'Lax' if DEBUG else 'Strict'
-SESSION_COOKIE_SAMESITE = 'Lax' if DEBUG else 'Strict'
\ No newline at end of file
+SESSION_COOKIE_SAMESITE = 'Lax' if DEBUG else 'Strict'
+
+# Spell checker
+# Max entries in each SpellChecker's word -> correctness LRU cache (0 disables it, None is unbounded)
+SPELLCHECK_LOOKUP_CACHE_SIZE = int(os.getenv('SPELLCHECK_LOOKUP_CACHE_SIZE', '50000'))
+
+# Answer exact forms from the prebuilt form index (manage.py build_form_indexes) before asking spylls
+SPELLCHECK_FORM_INDEX = os.getenv('SPELLCHECK_FORM_INDEX', 'True') == 'True'
+# Languages expanding to more candidate forms than this get no form index
+SPELLCHECK_FORM_INDEX_MAX_FORMS = int(os.getenv('SPELLCHECK_FORM_INDEX_MAX_FORMS', '2000000'))
+
+# Seconds a request waits for another thread that is already loading the same dictionary
+SPELLCHECK_LOAD_WAIT_TIMEOUT = float(os.getenv('SPELLCHECK_LOAD_WAIT_TIMEOUT', '60'))
+
+# Estimated memory (MB) that loaded dictionaries may use per worker before cold ones are unloaded (0 = unlimited).
+# It includes the worker's suggestion pool processes: each of the SUGGESTION_POOL_WORKERS + 1 processes
+# gets an equal share. Hot languages are never unloaded: workers share the master's copy, but the host
+# also holds one per pool process, workers * SUGGESTION_POOL_WORKERS of them (logged by gunicorn at startup)
+SPELLCHECK_MEMORY_BUDGET_MB = int(os.getenv('SPELLCHECK_MEMORY_BUDGET_MB', '0'))
+# 'lru' or 'lfu'
+SPELLCHECK_EVICTION_POLICY = os.getenv('SPELLCHECK_EVICTION_POLICY', 'lru')
+# Languages loaded in the gunicorn master before fork (see gunicorn.conf.py) so workers share them copy-on-write
+SPELLCHECK_HOT_LANGUAGES = [
+    code for code in os.getenv('SPELLCHECK_HOT_LANGUAGES', 'en_US').split(',') if code
+]
+# Languages that are never unloaded (hot languages are always pinned)
+SPELLCHECK_PINNED_LANGUAGES = [
+    code for code in os.getenv('SPELLCHECK_PINNED_LANGUAGES', 'en_US').split(',') if code
+]
+
+# Longest raw text (in characters) accepted by the document check endpoint
+SPELLCHECK_MAX_TEXT_LENGTH = int(os.getenv('SPELLCHECK_MAX_TEXT_LENGTH', '1000000'))
+
+# Open documents kept per worker for incremental re-checking when DOCUMENT_SESSION_CACHE_ALIAS
+# isn't Redis (least recently used are dropped first)
+DOCUMENT_SESSION_MAX_COUNT = int(os.getenv('DOCUMENT_SESSION_MAX_COUNT', '1000'))
+# Seconds without a request before a document session expires
+DOCUMENT_SESSION_TTL = int(os.getenv('DOCUMENT_SESSION_TTL', str(30 * 60)))
+
+# Processes per gunicorn worker that compute suggestions in parallel (0 computes them in the request thread)
+SUGGESTION_POOL_WORKERS = int(os.getenv('SUGGESTION_POOL_WORKERS', '0'))
+# How pool processes are started: 'forkserver' (or 'spawn'), never 'fork' from a threaded worker.
+# Each one loads SPELLCHECK_HOT_LANGUAGES itself, so they don't share the worker's dictionary memory:
+# size the pool for the host (workers * SUGGESTION_POOL_WORKERS processes in total), not per worker
+SUGGESTION_POOL_START_METHOD = os.getenv('SUGGESTION_POOL_START_METHOD', 'forkserver')
+# Seconds a suggestion request may spend before returning partial results marked incomplete (0 = no deadline)
+SUGGESTION_REQUEST_DEADLINE = float(os.getenv('SUGGESTION_REQUEST_DEADLINE', '60'))
+
+# Answer suggestion requests from the replacements users actually chose (WordReplacement), refreshed
+# every REPLACEMENT_HISTORY_REFRESH_SECONDS; a replacement needs REPLACEMENT_HISTORY_MIN_COUNT distinct signed-in users to be served
+REPLACEMENT_HISTORY_ENABLED = os.getenv('REPLACEMENT_HISTORY_ENABLED', 'True') == 'True'
+REPLACEMENT_HISTORY_REFRESH_SECONDS = int(os.getenv('REPLACEMENT_HISTORY_REFRESH_SECONDS', '60'))
+REPLACEMENT_HISTORY_MIN_COUNT = int(os.getenv('REPLACEMENT_HISTORY_MIN_COUNT', '3'))
+REPLACEMENT_HISTORY_MAX_SUGGESTIONS = int(os.getenv('REPLACEMENT_HISTORY_MAX_SUGGESTIONS', '5'))
+
+# Page size (default and largest allowed) of the all-replacements admin view, and rows fetched
+# per database round trip by its streaming CSV/NDJSON export
+REPLACEMENTS_PAGE_SIZE = int(os.getenv('REPLACEMENTS_PAGE_SIZE', '1000'))
+REPLACEMENTS_PAGE_MAX = int(os.getenv('REPLACEMENTS_PAGE_MAX', '10000'))
+REPLACEMENTS_EXPORT_CHUNK_SIZE = int(os.getenv('REPLACEMENTS_EXPORT_CHUNK_SIZE', '2000'))
+
+# Bearer token required by the Prometheus /metrics endpoint; empty leaves it open (e.g. when
+# only reachable from the internal network). Multiprocess collection is set up in gunicorn.conf.py
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Admins can profile single check/suggestion requests with an "X-Profile: 1" header (see
+# RequestProfilingMiddleware); the newest PROFILE_MAX_COUNT profiles are kept in PROFILE_DIR
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'True') == 'True'
+PROFILE_DIR = os.getenv('PROFILE_DIR', str(BASE_DIR / 'profiles'))
+PROFILE_MAX_COUNT = int(os.getenv('PROFILE_MAX_COUNT', '200'))
+
+# Buffer POST /api/replacements/ rows in memory and write them in batches (see ReplacementBufferService):
+# flushed every REPLACEMENT_BUFFER_FLUSH_INTERVAL seconds, at REPLACEMENT_BUFFER_FLUSH_SIZE rows and on
+# worker shutdown. Past REPLACEMENT_BUFFER_MAX_PENDING rows, 'sync' writes directly and 'drop' discards.
+REPLACEMENT_BUFFER_ENABLED = os.getenv('REPLACEMENT_BUFFER_ENABLED', 'False') == 'True'
+REPLACEMENT_BUFFER_FLUSH_SIZE = int(os.getenv('REPLACEMENT_BUFFER_FLUSH_SIZE', '500'))
+REPLACEMENT_BUFFER_FLUSH_INTERVAL = float(os.getenv('REPLACEMENT_BUFFER_FLUSH_INTERVAL', '5'))
+REPLACEMENT_BUFFER_MAX_PENDING = int(os.getenv('REPLACEMENT_BUFFER_MAX_PENDING', '10000'))
+REPLACEMENT_BUFFER_OVERFLOW = os.getenv('REPLACEMENT_BUFFER_OVERFLOW', 'sync')
+
+# Threads per worker running spell-check work for the async (ASGI) endpoints
+SPELLCHECK_ASYNC_EXECUTOR_WORKERS = int(os.getenv('SPELLCHECK_ASYNC_EXECUTOR_WORKERS', '4'))
+# Async requests allowed to wait for those threads before new ones get a 503
+SPELLCHECK_ASYNC_MAX_PENDING = int(os.getenv('SPELLCHECK_ASYNC_MAX_PENDING', '256'))
+
+# Redis server shared by every worker and host, e.g. redis://localhost:6379/0. It is the default
+# backend of the caches below, which fall back to per-process memory without it
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+# Suggestion cache, keyed by (language, dictionary version, word). SUGGESTION_CACHE_URL selects
+# the backend and defaults to REDIS_URL:
+#   - a redis:// URL (requires the redis package) shares entries between all workers and hosts;
+#   - "file" shares them between the workers of one host through files on local disk. The file
+#     cache lists its whole directory on every write, so it gets a much smaller
+#     SUGGESTION_CACHE_FILE_MAX_ENTRIES: it trades slower writes and fewer cached words for hits
+#     across workers;
+#   - empty (no REDIS_URL either) or "locmem" is only a per-process fallback: every worker keeps
+#     and fills its own cache, and nothing computed by one worker is reused by another.
+SUGGESTION_CACHE_ALIAS = 'suggestions'
+SUGGESTION_CACHE_URL = os.getenv('SUGGESTION_CACHE_URL', REDIS_URL)
+SUGGESTION_CACHE_TIMEOUT = int(os.getenv('SUGGESTION_CACHE_TIMEOUT', str(60 * 60 * 24)))  # seconds
+SUGGESTION_CACHE_MAX_ENTRIES = int(os.getenv('SUGGESTION_CACHE_MAX_ENTRIES', '100000'))
+SUGGESTION_CACHE_FILE_MAX_ENTRIES = int(os.getenv('SUGGESTION_CACHE_FILE_MAX_ENTRIES', '5000'))
+
+if SUGGESTION_CACHE_URL.startswith(('redis://', 'rediss://', 'unix://')):
+    suggestion_cache = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': SUGGESTION_CACHE_URL,
+    }
+elif SUGGESTION_CACHE_URL == 'file':
+    suggestion_cache = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('SUGGESTION_CACHE_DIR', str(BASE_DIR / '.cache' / 'suggestions')),
+        'OPTIONS': {'MAX_ENTRIES': SUGGESTION_CACHE_FILE_MAX_ENTRIES, 'CULL_FREQUENCY': 3},
+    }
+else:
+    suggestion_cache = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'suggestions',
+        'OPTIONS': {'MAX_ENTRIES': SUGGESTION_CACHE_MAX_ENTRIES},
+    }
+suggestion_cache['TIMEOUT'] = SUGGESTION_CACHE_TIMEOUT
+suggestion_cache['KEY_PREFIX'] = 'hunspell'
+
+# Cache for state every worker process must agree on (personal word list versions, document
+# sessions and their locks). It needs atomic add()/incr() and no culling of live entries, so
+# only Redis is used: SHARED_CACHE_URL, defaulting to REDIS_URL. Without it this is a per-process
+# locmem fallback, and the features relying on it keep their state in each worker instead
+# (see hunspell/shared_cache.py).
+SHARED_CACHE_ALIAS = 'shared'
+SHARED_CACHE_URL = os.getenv('SHARED_CACHE_URL', REDIS_URL)
+
+if SHARED_CACHE_URL.startswith(('redis://', 'rediss://', 'unix://')):
+    shared_cache = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': SHARED_CACHE_URL,
+    }
+else:
+    shared_cache = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'shared',
+    }
+shared_cache['KEY_PREFIX'] = 'hunspell'
+
+# Users whose personal dictionary words are kept in memory per worker, per language
+PERSONAL_WORDS_CACHE_SIZE = int(os.getenv('PERSONAL_WORDS_CACHE_SIZE', '10000'))
+# Words per page returned by the personal dictionary/starlist word lists, and the largest page a client may ask for
+PERSONAL_WORDS_PAGE_SIZE = int(os.getenv('PERSONAL_WORDS_PAGE_SIZE', '1000'))
+PERSONAL_WORDS_PAGE_MAX = int(os.getenv('PERSONAL_WORDS_PAGE_MAX', '5000'))
+# Most words accepted by one bulk add/remove request
+PERSONAL_WORDS_BULK_MAX = int(os.getenv('PERSONAL_WORDS_BULK_MAX', '5000'))
+# Cache shared by all workers that holds the version counters used to invalidate those words.
+# Must be shared across processes; with a per-process backend ETags and the in-memory word sets are off
+PERSONAL_WORDS_SHARED_CACHE_ALIAS = SHARED_CACHE_ALIAS
+# Cache holding incremental-checking document sessions, so any worker can apply a document's edits
+# (only used when it is Redis, see SHARED_CACHE_URL)
+DOCUMENT_SESSION_CACHE_ALIAS = SHARED_CACHE_ALIAS
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    SUGGESTION_CACHE_ALIAS: suggestion_cache,
+    SHARED_CACHE_ALIAS: shared_cache,
+}
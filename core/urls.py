@@ -22,7 +22,7 @@ from drf_yasg import openapi
 from django.http import HttpResponse, HttpResponseServerError
 from django.db import connections
 from django.db.utils import OperationalError
-from .views import health_check
+from .views import health_check, metrics
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -46,4 +46,5 @@ urlpatterns = [
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     path('accounts/', include('allauth.urls')),
     path('health/', health_check, name='health_check'),
+    path('metrics', metrics, name='metrics'),
 ]
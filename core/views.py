@@ -1,6 +1,10 @@
-from django.http import HttpResponse, HttpResponseServerError
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseServerError
 from django.db import connections
 from django.db.utils import OperationalError
+from django.utils.crypto import constant_time_compare
+from prometheus_client import CONTENT_TYPE_LATEST
+from hunspell.metrics import render
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,4 +19,11 @@ def health_check(request):
         return HttpResponse("OK")
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
-        return HttpResponseServerError(f"Health check failed: {str(e)}")
\ No newline at end of file
+        return HttpResponseServerError(f"Health check failed: {str(e)}")
+
+def metrics(request):
+    # Scrapers authenticate with "Authorization: Bearer <METRICS_TOKEN>" when a token is set
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f"Bearer {token}"):
+        return HttpResponseForbidden("Invalid metrics token")
+    return HttpResponse(render(), content_type=CONTENT_TYPE_LATEST)
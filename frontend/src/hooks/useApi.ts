@@ -3,13 +3,11 @@ import { apiRequest } from '../config/api';
 import { SpellingResult, SpellingSuggestion } from '../types/spelling';
 import { LANGUAGE_CODE_MAP } from '../constants/language';
 import { toast } from 'react-toastify';
-import { useUserData } from '../hooks/useUserData';
 import { useAuthContext } from '../contexts/AuthContext';
 
 export const useApi = (selectedLanguage: string) => {
   const [spellingResults, setSpellingResults] = useState<SpellingResult[]>([]);
   const [suggestionCache, setSuggestionCache] = useState<Record<string, string[]>>({});
-  const { fetchDictionaryWords, dictionaryWords } = useUserData();
   const { accessToken } = useAuthContext();
   
   // Batch fetch suggestions for multiple words
@@ -67,14 +65,6 @@ export const useApi = (selectedLanguage: string) => {
     const languageCode = LANGUAGE_CODE_MAP[selectedLanguage] || 'en_US';
 
     try {
-      // Only fetch dictionary words if user is logged in
-      let userDictionaryWords: string[] = [];
-      if (accessToken) {
-        await fetchDictionaryWords(languageCode);
-        userDictionaryWords = dictionaryWords[languageCode] || [];
-      }
-
-      // Rest of the spelling check logic
       const wordRegex = /[\p{L}\p{M}]+/gu;
       let match;
       const wordsWithIndices: { word: string; index: number }[] = [];
@@ -99,18 +89,14 @@ export const useApi = (selectedLanguage: string) => {
 
       if (!response.ok) throw new Error("Failed to check spelling");
       
+      // The server already accepts words from a logged-in user's personal dictionary
       const result = await response.json();
       const incorrectWords = result.results
         .filter((res: { word: string; is_correct: boolean }) => !res.is_correct)
         .map((res: { word: string; is_correct: boolean }) => res.word);
 
-      // Only filter with dictionary words if user is logged in
-      const filteredIncorrectWords = accessToken 
-        ? incorrectWords.filter(word => !userDictionaryWords.includes(word))
-        : incorrectWords;
-
       const newResults = wordsWithIndices
-        .filter(({ word }) => filteredIncorrectWords.includes(word))
+        .filter(({ word }) => incorrectWords.includes(word))
         .map(({ word, index }) => ({
           index,
           length: word.length,
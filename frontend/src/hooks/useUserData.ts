@@ -15,6 +15,24 @@ interface Replacement {
   user__username: string;
 }
 
+// Word lists are paginated; follow next_cursor until the last page
+const fetchAllWords = async (endpoint: string, options: RequestInit = {}): Promise<string[]> => {
+  let words: string[] = [];
+  let cursor: string | null = null;
+  do {
+    const query: string = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+    const response = await apiRequest(`${endpoint}${query}`, options);
+    if (!response.ok) {
+      const errorData = await response.json();
+      throw new Error(errorData.error || 'Failed to fetch data');
+    }
+    const data = await response.json();
+    words = words.concat(data.words);
+    cursor = data.next_cursor;
+  } while (cursor);
+  return words;
+};
+
 export const useUserData = () => {
   const [dictionaryWords, setDictionaryWords] = useState<LanguageWords>({});
   const [starListWords, setStarListWords] = useState<LanguageWords>({});
@@ -64,21 +82,13 @@ export const useUserData = () => {
     }
 
     try {
-      const response = await apiRequest(`/api/dictionary/words/?language=${language}`, {
+      const words = await fetchAllWords(`/api/dictionary/words/?language=${language}`, {
         method: 'GET'
       });
-      
-      if (response.ok) {
-        const data = await response.json();
-        console.log('Received dictionary words:', data.words); // Debug log
-        setDictionaryWords(prev => ({
-          ...prev,
-          [language]: data.words
-        }));
-      } else {
-        const errorData = await response.json();
-        throw new Error(errorData.error || 'Failed to fetch data');
-      }
+      setDictionaryWords(prev => ({
+        ...prev,
+        [language]: words
+      }));
     } catch (error) {
       console.error('Error fetching dictionary words:', error);
       toast.error('Failed to load dictionary words');
@@ -88,23 +98,16 @@ export const useUserData = () => {
   const fetchStarListWords = async (language: string) => {
     try {
       const accessToken = localStorage.getItem('accessToken');
-      const response = await apiRequest(`/api/star-list/words/?language=${language}`, {
+      const words = await fetchAllWords(`/api/star-list/words/?language=${language}`, {
         method: 'GET',
         headers: {
           'Authorization': `Bearer ${accessToken}`
         }
       });
-      
-      if (response.ok) {
-        const data = await response.json();
-        setStarListWords(prev => ({
-          ...prev,
-          [language]: data.words
-        }));
-      } else {
-        const errorData = await response.json();
-        throw new Error(errorData.error || 'Failed to fetch data');
-      }
+      setStarListWords(prev => ({
+        ...prev,
+        [language]: words
+      }));
     } catch (error) {
       console.error('Error fetching star list words:', error);
       toast.error('Failed to load star list words');
@@ -16,7 +16,6 @@ import {
   FaSignOutAlt,
 } from "react-icons/fa";
 import { useApi } from "../hooks/useApi";
-import { useUserData } from "../hooks/useUserData";
 import { styles as inlineStyles } from "../styles/HomePage.styles";
 import { LanguageOption, SpellingResult } from "../types/spelling";
 import styles from "../styles/HomePage.module.css";
@@ -72,7 +71,6 @@ const HomePage: React.FC = () => {
     recordReplacement,
   } = useApi(selectedOption.value);
 
-  const { fetchDictionaryWords, dictionaryWords } = useUserData();
 
   const options: LanguageOption[] = [...LANGUAGE_OPTIONS];
 
@@ -210,16 +208,11 @@ const HomePage: React.FC = () => {
     const loadingToast = toast.loading("Checking spelling...");
 
     try {
-      // Fetch user's dictionary words for the selected language
-      await fetchDictionaryWords(selectedOption.value);
-      const userDictionaryWords = dictionaryWords[selectedOption.value] || [];
-
+      // Words in the user's dictionary are already accepted by the server
       const results = await checkSpelling(text);
-      // Filter out ignored words and words in the user's dictionary
+      // Filter out ignored words
       const newResults = results.filter(
-        (result) =>
-          !ignoredWords.has(result.word.toLowerCase()) &&
-          !userDictionaryWords.includes(result.word)
+        (result) => !ignoredWords.has(result.word.toLowerCase())
       );
 
       toast.dismiss(loadingToast);
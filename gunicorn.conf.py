@@ -1,14 +1,88 @@
 # gunicorn.conf.py
 import os
 import multiprocessing
+import shutil
+import tempfile
+
+# Every worker writes its Prometheus samples to files here, which /metrics adds up.
+# Must be set before the app (and prometheus_client) is imported
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "hunspell-metrics"))
 
 # Number of workers based on CPU cores
 workers = multiprocessing.cpu_count() * 2 + 1
 bind = "0.0.0.0:8080"
 timeout = 120
 # Add these recommended settings
-worker_class = "gthread"
+# Set GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker and serve core.asgi:application
+# for the async endpoints (threads is ignored by uvicorn workers)
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
 threads = 2
 max_requests = 1000
 max_requests_jitter = 50
-keepalive = 5
\ No newline at end of file
+# Raise for the ASGI mode so idle editor connections stay open between keystroke batches
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Load the app in the master so hot dictionaries are shared copy-on-write by all workers,
+# including the ones recycled by max_requests
+preload_app = True
+
+def on_starting(server):
+    import gc
+    from django.conf import settings
+    from django.db import connections
+    from hunspell.metrics import mark_process_dead
+    from hunspell.services.replacement_history_service import replacement_history
+    from hunspell.services.spell_check_service import spell_checker_service
+
+    # Start from empty metrics, so counters of a previous run (and pids reused since) don't add up
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+    durations = spell_checker_service.preload(settings.SPELLCHECK_HOT_LANGUAGES)
+    for lang_code, duration in durations.items():
+        server.log.info("Preloaded dictionary %s in %.2fs", lang_code, duration)
+
+    # Workers share the master's copy, but every suggestion pool process loads its own
+    pool_processes = server.cfg.workers * settings.SUGGESTION_POOL_WORKERS
+    if pool_processes:
+        hot_mb = spell_checker_service.total_estimated_size() / (1024 * 1024)
+        server.log.info(
+            "%d suggestion pool processes (%d per worker) each load the hot dictionaries: about %.0f MB "
+            "on top of the master's %.0f MB; SPELLCHECK_MEMORY_BUDGET_MB is split between a worker and its pool",
+            pool_processes, settings.SUGGESTION_POOL_WORKERS, pool_processes * hot_mb, hot_mb
+        )
+
+    # Workers start with the replacement history instead of each loading it on first use
+    if replacement_history.enabled():
+        replacement_history.refresh()
+        # A connection opened in the master must not be shared by the forked workers
+        connections.close_all()
+
+    # The master serves nothing: each worker reports the dictionaries it inherited in post_fork,
+    # so they are counted once per process holding them
+    mark_process_dead(os.getpid())
+
+    # Move everything loaded so far out of the collector's reach, so the workers'
+    # GC passes never write to (and un-share) the inherited dictionary pages
+    gc.freeze()
+
+def post_fork(server, worker):
+    from hunspell.services.spell_check_service import spell_checker_service
+
+    spell_checker_service.report_loaded_metrics()
+
+def worker_exit(server, worker):
+    # Write buffered word replacements before the worker goes away
+    from hunspell.services.replacement_buffer_service import replacement_buffer
+
+    written = replacement_buffer.shutdown()
+    if written:
+        server.log.info("Worker %s flushed %d buffered word replacements", worker.pid, written)
+
+def child_exit(server, worker):
+    # Runs in the master; the worker's live gauges (loaded dictionaries) stop counting,
+    # and so do those of its suggestion pool processes if they didn't clean up after themselves
+    from hunspell.metrics import mark_exited_processes, mark_process_dead
+
+    mark_process_dead(worker.pid)
+    mark_exited_processes()
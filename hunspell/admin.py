@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import PersonalDictionary, WordReplacement
+from .models import PersonalDictionary, WordReplacement, WordReplacementDailyRollup
 
 @admin.register(PersonalDictionary)
 class PersonalDictionaryAdmin(admin.ModelAdmin):
@@ -22,3 +22,10 @@ class WordReplacementAdmin(admin.ModelAdmin):
         if obj:
             return ['original_word', 'replacement_word', 'lang_code', 'created_at']
         return []
+
+@admin.register(WordReplacementDailyRollup)
+class WordReplacementDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('day', 'original_word', 'replacement_word', 'lang_code', 'count')
+    list_filter = ('lang_code', 'day')
+    search_fields = ('original_word', 'replacement_word')
+    ordering = ('-day', '-count')
@@ -0,0 +1,188 @@
+"""
+Async versions of the spell-check endpoints, for serving under ASGI
+(e.g. gunicorn with uvicorn workers, see gunicorn.conf.py).
+
+Idle keep-alive connections cost nothing but a coroutine here; the CPU-bound
+spylls work runs on a bounded thread pool, and requests beyond
+SPELLCHECK_ASYNC_MAX_PENDING are turned away with 503 instead of queueing forever.
+Requests are authenticated with the same JWT as the DRF views, so a signed-in user's
+personal dictionary words are accepted (and not sent to suggest) here as well.
+"""
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .metrics import REQUEST_WORDS
+from .services.personal_word_overlay_service import personal_word_overlay
+from .services.spell_check_service import spell_checker_service
+
+
+class _BoundedExecutor:
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'SPELLCHECK_ASYNC_EXECUTOR_WORKERS', 4),
+                    thread_name_prefix='spellcheck'
+                )
+            return self._executor
+
+    def try_acquire(self):
+        with self._lock:
+            if self.pending >= getattr(settings, 'SPELLCHECK_ASYNC_MAX_PENDING', 256):
+                return False
+            self.pending += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.pending -= 1
+
+    async def run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+
+spellcheck_executor = _BoundedExecutor()
+
+
+def _parse_words(request):
+    """
+    Returns:
+        tuple: (words, language, request data, error response or None)
+    """
+    try:
+        data = json.loads(request.body or b'{}')
+    except (ValueError, UnicodeDecodeError):
+        return None, None, None, JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+    if not isinstance(data, dict):
+        return None, None, None, JsonResponse({"error": "A list of words is required"}, status=400)
+
+    words = data.get('words')
+    language = data.get('language', 'en_US')
+    if not words or not isinstance(words, list):
+        return None, None, None, JsonResponse({"error": "A list of words is required"}, status=400)
+    return words, language, data, None
+
+
+async def _get_personal_words(request, language):
+    """
+    Authenticate the request's JWT like the DRF views do and load the user's personal words
+
+    Returns:
+        tuple: (lower-cased personal words, empty for anonymous requests; error response or None)
+    """
+    try:
+        authenticated = await sync_to_async(JWTAuthentication().authenticate)(request)
+    except AuthenticationFailed as e:
+        detail = e.detail if isinstance(e.detail, dict) else {"detail": e.detail}
+        return None, JsonResponse(detail, status=401, headers={"WWW-Authenticate": 'Bearer realm="api"'})
+    user = authenticated[0] if authenticated else None
+    personal_words = await sync_to_async(personal_word_overlay.get_words)(user, language)
+    return personal_words, None
+
+
+def _check_words(words, language, personal_words):
+    spell_checker = spell_checker_service.get_spell_checker(language)
+    return [
+        {
+            "word": word,
+            "is_correct": is_correct
+        }
+        for word, is_correct in zip(words, spell_checker.check_many(words, personal_words))
+    ]
+
+
+def suggest_words(words, language, use_history, personal_words):
+    """
+    Suggestions for a request's words, shared with the live-check WebSocket
+
+    Returns:
+        tuple: (dict of word -> suggestions without the word itself, list of words not finished in time)
+    """
+    # Words in the user's personal dictionary are correct, so they skip the expensive suggest step
+    skipped_words = [word for word in words if personal_word_overlay.contains(personal_words, word)]
+    if skipped_words:
+        words = [word for word in words if not personal_word_overlay.contains(personal_words, word)]
+    word_suggestions, pending_words = spell_checker_service.get_suggestions_many(
+        words, language, use_history=use_history
+    )
+    suggestions = {word: [] for word in skipped_words}
+    for word, candidates in word_suggestions.items():
+        filtered_suggestions = [s for s in candidates if s != word]
+        suggestions[word] = filtered_suggestions if filtered_suggestions else []
+    return suggestions, pending_words
+
+
+def _busy_response():
+    return JsonResponse({"error": "Server is busy, please retry"}, status=503, headers={"Retry-After": "1"})
+
+
+@csrf_exempt
+@require_POST
+async def async_check_spelling(request):
+    words, language, _, error = _parse_words(request)
+    if error:
+        return error
+
+    personal_words, error = await _get_personal_words(request, language)
+    if error:
+        return error
+
+    REQUEST_WORDS.labels('async_check').observe(len(words))
+    if not spellcheck_executor.try_acquire():
+        return _busy_response()
+    try:
+        results = await spellcheck_executor.run(_check_words, words, language, personal_words)
+    finally:
+        spellcheck_executor.release()
+
+    return JsonResponse({
+        "results": results,
+        "language": language
+    })
+
+
+@csrf_exempt
+@require_POST
+async def async_suggest_corrections(request):
+    words, language, data, error = _parse_words(request)
+    if error:
+        return error
+
+    personal_words, error = await _get_personal_words(request, language)
+    if error:
+        return error
+
+    REQUEST_WORDS.labels('async_suggest').observe(len(words))
+    if not spellcheck_executor.try_acquire():
+        return _busy_response()
+    try:
+        suggestions, pending_words = await spellcheck_executor.run(
+            suggest_words, words, language, not data.get('more'), personal_words
+        )
+    finally:
+        spellcheck_executor.release()
+
+    response_data = {
+        "suggestions": suggestions,
+        "language": language,
+        "incomplete": bool(pending_words)
+    }
+    if pending_words:
+        response_data["pending_words"] = pending_words
+    return JsonResponse(response_data)
@@ -0,0 +1,208 @@
+"""
+Offline micro-benchmarks of the spell-check engine, one language at a time.
+
+Used by ``manage.py benchmark_spellchecker``, which runs each language in a fresh
+process so load time and peak RSS aren't skewed by the languages measured before it.
+"""
+import json
+import platform
+import random
+import resource
+import sys
+import time
+from pathlib import Path
+
+from spylls.hunspell import Dictionary
+
+from .check_spell import SpellChecker
+from .dict_snapshot import SPYLLS_VERSION, load_snapshot, snapshot_path
+from .tokenizer import Tokenizer
+
+CORPUS_DIR = Path(__file__).parent / 'benchmarks' / 'corpus'
+
+# Metric -> True if a higher value is better
+METRICS = {
+    'load_seconds': False,
+    'snapshot_load_seconds': False,
+    'peak_rss_mb': False,
+    'check_valid_per_second': True,
+    'check_invalid_per_second': True,
+    'suggest_p50_ms': False,
+    'suggest_p95_ms': False,
+    'suggest_p99_ms': False,
+}
+
+
+def config_languages():
+    """
+    Returns:
+        list: Language codes from dicts_config/*.json, sorted
+    """
+    languages = set()
+    for config_file in sorted(SpellChecker.config_path.glob('*.json')):
+        with open(config_file, 'r') as f:
+            languages.update(json.load(f).keys())
+    return sorted(languages)
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _mutate(word, rng):
+    chars = list(word)
+    position = rng.randrange(len(chars))
+    operation = rng.choice(('swap', 'delete', 'double', 'replace'))
+    if operation == 'swap' and len(chars) > 1:
+        position = min(position, len(chars) - 2)
+        chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    elif operation == 'delete' and len(chars) > 3:
+        del chars[position]
+    elif operation == 'double':
+        chars.insert(position, chars[position])
+    else:
+        chars[position] = rng.choice(word)
+    return ''.join(chars)
+
+
+def build_corpus(lang_code, dictionary, size, seed=0):
+    """
+    Valid and invalid tokens to measure with: the words of the bundled corpus
+    (benchmarks/corpus/<lang_code>.txt) when there is one, topped up with a seeded
+    sample of dictionary stems, and misspellings made by editing valid words
+
+    Returns:
+        tuple: (list of valid words, list of invalid words), both without duplicates
+    """
+    rng = random.Random(seed)
+    valid, invalid = {}, {}
+
+    corpus_file = CORPUS_DIR / f'{lang_code}.txt'
+    if corpus_file.exists():
+        for word, _, _ in Tokenizer(dictionary.aff).tokenize(corpus_file.read_text(encoding='utf-8')):
+            (valid if dictionary.lookup(word) else invalid)[word] = None
+
+    stems = [word.stem for word in dictionary.dic.words if len(word.stem) >= 3 and ' ' not in word.stem]
+    for stem in rng.sample(stems, min(len(stems), size * 3)):
+        if len(valid) >= size:
+            break
+        if dictionary.lookup(stem):
+            valid[stem] = None
+
+    candidates = list(valid)
+    attempts = 0
+    while candidates and len(invalid) < size and attempts < size * 20:
+        attempts += 1
+        misspelled = _mutate(rng.choice(candidates), rng)
+        if misspelled not in valid and not dictionary.lookup(misspelled):
+            invalid[misspelled] = None
+
+    return list(valid)[:size], list(invalid)[:size]
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def _check_throughput(spell_checker, words, rounds):
+    # Cleared before each round so every word goes through the engine, not the LRU cache
+    best = None
+    for _ in range(rounds):
+        spell_checker.clear_cache()
+        start = time.perf_counter()
+        for word in words:
+            spell_checker.check_text(word)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return round(len(words) / best, 1) if best else None
+
+
+def benchmark_language(lang_code, corpus_size=2000, suggest_samples=20, check_rounds=3, seed=0):
+    """
+    Measure one language. Meant to run in a process of its own (see module docstring).
+
+    Returns:
+        dict: Metric name -> value (see METRICS), plus corpus sizes
+    """
+    dict_path = SpellChecker.find_dict_path(lang_code)
+
+    start = time.perf_counter()
+    dictionary = Dictionary.from_files(str(dict_path))
+    load_seconds = time.perf_counter() - start
+    peak_rss_mb = _peak_rss_mb()
+
+    snapshot_load_seconds = None
+    if snapshot_path(dict_path).exists():
+        start = time.perf_counter()
+        if load_snapshot(dict_path) is not None:
+            snapshot_load_seconds = round(time.perf_counter() - start, 3)
+
+    valid, invalid = build_corpus(lang_code, dictionary, corpus_size, seed)
+    del dictionary
+
+    spell_checker = SpellChecker(lang_code)
+    result = {
+        'load_seconds': round(load_seconds, 3),
+        'snapshot_load_seconds': snapshot_load_seconds,
+        'peak_rss_mb': peak_rss_mb,
+        'valid_words': len(valid),
+        'invalid_words': len(invalid),
+        'check_valid_per_second': _check_throughput(spell_checker, valid, check_rounds),
+        'check_invalid_per_second': _check_throughput(spell_checker, invalid, check_rounds),
+    }
+
+    latencies = []
+    for word in invalid[:suggest_samples]:
+        start = time.perf_counter()
+        spell_checker.get_suggestions(word)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    for name, fraction in (('suggest_p50_ms', 0.50), ('suggest_p95_ms', 0.95), ('suggest_p99_ms', 0.99)):
+        result[name] = round(_percentile(latencies, fraction), 2) if latencies else None
+    result['suggest_samples'] = len(latencies)
+    return result
+
+
+def environment():
+    return {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'spylls': SPYLLS_VERSION,
+        'platform': platform.platform(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare per-language metrics with a baseline run
+
+    Args:
+        results: {"languages": {lang: metrics}} from this run
+        baseline: The same structure from an earlier run
+        threshold: Relative change (0.2 = 20%) in the bad direction reported as a regression
+
+    Returns:
+        list: {"language", "metric", "baseline", "current", "change", "regression"} per compared metric
+    """
+    comparisons = []
+    for lang_code, metrics in sorted(results['languages'].items()):
+        base_metrics = baseline.get('languages', {}).get(lang_code)
+        if not base_metrics or 'error' in metrics or 'error' in base_metrics:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            current, previous = metrics.get(metric), base_metrics.get(metric)
+            if current is None or not previous:
+                continue
+            change = (current - previous) / previous
+            worse = -change if higher_is_better else change
+            comparisons.append({
+                'language': lang_code,
+                'metric': metric,
+                'baseline': previous,
+                'current': current,
+                'change': round(change, 3),
+                'regression': worse > threshold,
+            })
+    return comparisons
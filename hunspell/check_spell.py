@@ -1,8 +1,14 @@
 from django.conf import settings
-from spylls.hunspell import Dictionary
+from .dict_snapshot import load_dictionary
+from .form_index import form_index_size, load_form_index
+from .metrics import CHECK_SECONDS, LANGUAGE_FALLBACKS, LOOKUP_CACHE, SUGGEST_SECONDS
+from .tokenizer import Tokenizer
 import os
+import threading
+import time
 from pathlib import Path
 import json
+from functools import cached_property, lru_cache, partial
 
 class SpellChecker:
     # Load and merge dictionary configurations
@@ -28,41 +34,81 @@ class SpellChecker:
         try:
             if lang_code not in self.SUPPORTED_LANGUAGES:
                 print(f"Warning: Language '{lang_code}' not supported. Falling back to English.")
+                LANGUAGE_FALLBACKS.labels('unsupported', 'unsupported').inc()
                 self.lang_code = 'en_US'  # Update the stored language code
                 lang_code = 'en_US'
             
-            base_dir = Path(__file__).parent
-            dict_dir = base_dir / 'dicts' / lang_code
-            
-            # Look for any .aff files in the directory
-            aff_files = list(dict_dir.glob("*.aff"))
-            if not aff_files:
-                raise ValueError(f"No .aff files found for language: {lang_code}")
-            
-            # Try to find a matching .dic file for each .aff file
-            dict_path = None
-            for aff_file in aff_files:
-                base_name = aff_file.with_suffix('')
-                if base_name.with_suffix('.dic').exists():
-                    dict_path = base_name
-                    break
-            
-            if dict_path is None:
-                raise ValueError(f"No matching .aff and .dic pair found for language: {lang_code}")
+            dict_path = self.find_dict_path(lang_code)
             
             print(f"Loading dictionary files: {dict_path}.aff, {dict_path}.dic")
-            self.spell = Dictionary.from_files(str(dict_path))
+            self.spell, self.dict_version = load_dictionary(dict_path)
             
             if not self.spell:
                 raise ValueError(f"Failed to initialize Dictionary for language: {lang_code}")
                 
         except Exception as e:
             print(f"Error initializing Dictionary: {str(e)}")
+            LANGUAGE_FALLBACKS.labels(lang_code, 'load_error').inc()
             # Fallback to English if there's an error
             self.lang_code = 'en_US'  # Update the stored language code
-            fallback_dir = base_dir / 'dicts' / 'en_US'
-            fallback_path = fallback_dir / 'en_US'
-            self.spell = Dictionary.from_files(str(fallback_path))
+            dict_path = self.find_dict_path('en_US')
+            self.spell, self.dict_version = load_dictionary(dict_path)
+
+        # Exact surface forms expanded offline (manage.py build_form_indexes), answered without spylls
+        self.known_forms = frozenset()
+        if getattr(settings, 'SPELLCHECK_FORM_INDEX', True):
+            self.known_forms = load_form_index(dict_path, self.dict_version) or frozenset()
+
+        self.estimated_size = self.estimate_size(dict_path) + form_index_size(self.known_forms)
+
+        # Per-instance LRU of stripped word -> correctness, so repeated words skip spylls entirely.
+        # Bound to the Dictionary rather than self, so an evicted checker is freed by refcounting.
+        cache_size = getattr(settings, 'SPELLCHECK_LOOKUP_CACHE_SIZE', 50000)
+        self._cached_lookup = lru_cache(maxsize=cache_size)(partial(self._lookup, self.spell))
+
+        # Metric children bound once, so the hot path skips the label lookup
+        self._check_seconds = CHECK_SECONDS.labels(self.lang_code)
+        self._suggest_seconds = SUGGEST_SECONDS.labels(self.lang_code)
+        self._cache_hits = LOOKUP_CACHE.labels(self.lang_code, 'hit')
+        self._cache_misses = LOOKUP_CACHE.labels(self.lang_code, 'miss')
+        # Lookup cache counters already added to the metrics
+        self._reported_cache_info = (0, 0)
+        self._report_lock = threading.Lock()
+
+    @staticmethod
+    def find_dict_path(lang_code):
+        """
+        Locate the base path (without extension) of the .aff/.dic pair for a language
+        
+        Raises:
+            ValueError: If the language directory has no matching .aff/.dic pair
+        """
+        dict_dir = Path(__file__).parent / 'dicts' / lang_code
+        
+        # Look for any .aff files in the directory
+        aff_files = list(dict_dir.glob("*.aff"))
+        if not aff_files:
+            raise ValueError(f"No .aff files found for language: {lang_code}")
+        
+        # Try to find a matching .dic file for each .aff file
+        for aff_file in aff_files:
+            base_name = aff_file.with_suffix('')
+            if base_name.with_suffix('.dic').exists():
+                return base_name
+        
+        raise ValueError(f"No matching .aff and .dic pair found for language: {lang_code}")
+
+    @staticmethod
+    def estimate_size(dict_path):
+        """
+        Rough in-memory size in bytes of a loaded dictionary. spylls objects take
+        about 70x the size of the .aff/.dic text they were parsed from.
+        """
+        factor = getattr(settings, 'SPELLCHECK_MEMORY_FACTOR', 70)
+        source_size = sum(
+            os.path.getsize(f"{dict_path}{suffix}") for suffix in ('.aff', '.dic')
+        )
+        return int(source_size * factor)
 
     def check_text(self, text):
         try:
@@ -72,19 +118,94 @@ class SpellChecker:
                 
             # Remove extra whitespace but preserve case
             word = text.strip()
-            result = self.spell.lookup(word)
-            
-            # If initial check fails, try lowercase version as fallback
-            if not result:
-                result = self.spell.lookup(word.lower())
-            
-            return bool(result)
+            if word in self.known_forms:
+                return True
+            return self._cached_lookup(word)
             
         except Exception as e:
             print(f"Error checking text: {str(e)}")
             return False
 
+    def check_many(self, texts, personal_words=frozenset()):
+        """
+        Check a batch of words, evaluating each distinct word only once
+
+        Args:
+            texts: Words to check; anything that isn't a string is treated as misspelled
+            personal_words: Lower-cased words from the user's personal dictionary,
+                            accepted without consulting the dictionary
+
+        Returns:
+            list: Correctness of each input word, in the same order as ``texts``
+        """
+        start = time.perf_counter()
+        normalized = [text.strip() if isinstance(text, str) else '' for text in texts]
+        unique_results = {
+            word: (bool(word) and word.lower() in personal_words) or self.check_text(word)
+            for word in dict.fromkeys(normalized)
+        }
+        # Once per batch: observing every word would cost more than a cached lookup
+        self._check_seconds.observe(time.perf_counter() - start)
+        self._report_cache_stats()
+        return [unique_results[word] for word in normalized]
+
+    @cached_property
+    def tokenizer(self):
+        return Tokenizer(self.spell.aff)
+
+    def find_misspellings(self, text, personal_words=frozenset()):
+        """
+        Tokenize a raw document with this language's word characters and check every word
+
+        Returns:
+            tuple: (list of misspelled (word, start, end) tokens, total number of words)
+        """
+        tokens = list(self.tokenizer.tokenize(text))
+        results = self.check_many([word for word, _, _ in tokens], personal_words)
+        misspelled = [token for token, is_correct in zip(tokens, results) if not is_correct]
+        return misspelled, len(tokens)
+
+    @staticmethod
+    def _lookup(spell, word):
+        result = spell.lookup(word)
+        
+        # If initial check fails, try lowercase version as fallback
+        if not result:
+            result = spell.lookup(word.lower())
+        
+        return bool(result)
+
+    def cache_stats(self):
+        """
+        Hit/miss counters and size of the lookup result cache
+        """
+        info = self._cached_lookup.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+
+    def _report_cache_stats(self):
+        # lru_cache keeps running totals, so only the change since the last report is added
+        info = self._cached_lookup.cache_info()
+        with self._report_lock:
+            reported_hits, reported_misses = self._reported_cache_info
+            self._reported_cache_info = (info.hits, info.misses)
+        if info.hits > reported_hits:
+            self._cache_hits.inc(info.hits - reported_hits)
+        if info.misses > reported_misses:
+            self._cache_misses.inc(info.misses - reported_misses)
+
+    def clear_cache(self):
+        self._report_cache_stats()
+        with self._report_lock:
+            self._cached_lookup.cache_clear()
+            self._reported_cache_info = (0, 0)
+
     def get_suggestions(self, word):
+        start = time.perf_counter()
         try:
             # Returns a list of suggested corrections for the given word
             suggestions = list(self.spell.suggest(word))
@@ -92,3 +213,5 @@ class SpellChecker:
         except Exception as e:
             print(f"Error getting suggestions: {str(e)}")
             return []
+        finally:
+            self._suggest_seconds.observe(time.perf_counter() - start)
@@ -0,0 +1,168 @@
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .async_views import spellcheck_executor, suggest_words
+from .services.document_session_service import DocumentSession, RevisionMismatch
+from .services.personal_word_overlay_service import personal_word_overlay
+
+
+class ServerBusy(Exception):
+    pass
+
+
+@database_sync_to_async
+def _authenticate(token):
+    """
+    Returns:
+        User: The owner of a valid JWT access token
+
+    Raises:
+        AuthenticationFailed: If the token is invalid or expired, or its user is inactive
+    """
+    authentication = JWTAuthentication()
+    return authentication.get_user(authentication.get_validated_token(token))
+
+
+def _run_with_db(func, *args):
+    # Sessions read their owner's personal words in the executor thread, outside any
+    # request, so its connection is recycled the way Django does around requests
+    close_old_connections()
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+class LiveCheckConsumer(AsyncJsonWebsocketConsumer):
+    """
+    One WebSocket per open document. Signed-in users pass their access token, either as
+    ``?token=`` when connecting (an invalid one rejects the connection) or in the ``open``
+    message, so their personal dictionary words are accepted. Messages from the client:
+
+    * ``{"type": "open", "language": "en_US", "text": "...", "revision": 0, "token": "..."}``
+      starts (or restarts) the session and checks the whole text
+    * ``{"type": "edit", "revision": 1, "changes": [{"start": 4, "end": 6, "text": "xy"}]}``
+      applies edits (code point offsets) and re-checks only the words around them
+    * ``{"type": "suggest", "words": ["helo"], "more": false}`` asks for suggestions explicitly
+      (``more`` skips the replacement history and runs the full dictionary suggest)
+
+    The server answers with ``{"type": "check", "revision", "start", "end", "misspellings"}``
+    (misspellings replace whatever the client had marked inside ``[start, end)``), or
+    ``{"type": "error", ...}``. After an edit the check is followed by
+    ``{"type": "suggestions", "revision", "suggestions"}`` for the words it marked; the
+    misspellings of a whole document (``open``) get suggestions only when the client asks.
+    After a ``revision_mismatch`` error the client should re-``open``.
+    """
+
+    async def connect(self):
+        self.document = None
+        self.user_id = None
+        token = parse_qs(self.scope.get('query_string', b'').decode()).get('token')
+        if token:
+            try:
+                self.user_id = (await _authenticate(token[0])).id
+            except AuthenticationFailed:
+                await self.close(code=4401)
+                return
+        await self.accept()
+
+    async def receive_json(self, content, **kwargs):
+        if not isinstance(content, dict):
+            await self.send_error("invalid_message", "Messages must be JSON objects")
+            return
+
+        message_type = content.get('type')
+        try:
+            if message_type == 'open':
+                await self.open_document(content)
+            elif message_type == 'edit':
+                await self.edit_document(content)
+            elif message_type == 'suggest':
+                words = content.get('words')
+                if not words or not isinstance(words, list):
+                    raise ValidationError("A list of words is required")
+                await self.send_suggestions(words, use_history=not content.get('more'))
+            else:
+                await self.send_error("invalid_message", f"Unknown message type: {message_type}")
+        except RevisionMismatch as e:
+            await self.send_error("revision_mismatch", str(e.detail[0]), expected=self.document.revision + 1)
+        except ValidationError as e:
+            await self.send_error("invalid_message", str(e.detail[0]))
+        except AuthenticationFailed:
+            await self.send_error("unauthorized", "Invalid or expired token")
+        except ServerBusy:
+            await self.send_error("busy", "Server is busy, please retry")
+
+    async def open_document(self, content):
+        text = content.get('text', '')
+        language = content.get('language', 'en_US')
+        revision = content.get('revision', 0)
+        if not isinstance(text, str) or not isinstance(revision, int):
+            raise ValidationError("open needs a text string and an integer revision")
+        if len(text) > getattr(settings, 'SPELLCHECK_MAX_TEXT_LENGTH', 1000000):
+            raise ValidationError("Text is too long")
+
+        token = content.get('token')
+        if token is not None:
+            if not isinstance(token, str):
+                raise ValidationError("token must be a string")
+            self.user_id = (await _authenticate(token)).id
+
+        self.document = DocumentSession(language, text, revision, self.user_id)
+        misspelled = await self.run(self.document.check_all)
+        # A whole document can have any number of misspellings; suggestions are asked for
+        await self.push_results(0, len(text), misspelled, suggest=False)
+
+    async def edit_document(self, content):
+        if self.document is None:
+            raise ValidationError("Send an open message first")
+        revision = content.get('revision')
+        changes = content.get('changes')
+        if not isinstance(revision, int) or not isinstance(changes, list):
+            raise ValidationError("edit needs an integer revision and a list of changes")
+
+        start, end, misspelled = await self.run(self.document.edit, revision, changes)
+        await self.push_results(start, end, misspelled)
+
+    async def push_results(self, start, end, misspelled, suggest=True):
+        revision = self.document.revision
+        await self.send_json({
+            "type": "check",
+            "revision": revision,
+            "start": start,
+            "end": end,
+            "misspellings": [
+                {"word": word, "offset": word_start, "length": word_end - word_start}
+                for word, word_start, word_end in misspelled
+            ],
+        })
+        if misspelled and suggest:
+            await self.send_suggestions([word for word, _, _ in misspelled], revision)
+
+    async def send_suggestions(self, words, revision=None, use_history=True):
+        language = self.document.language if self.document else 'en_US'
+        personal_words = await database_sync_to_async(personal_word_overlay.get_user_words)(self.user_id, language)
+        suggestions, pending_words = await self.run(suggest_words, words, language, use_history, personal_words)
+        await self.send_json({
+            "type": "suggestions",
+            "revision": revision,
+            "suggestions": suggestions,
+            "incomplete": bool(pending_words),
+        })
+
+    async def send_error(self, code, message, **extra):
+        await self.send_json({"type": "error", "code": code, "error": message, **extra})
+
+    async def run(self, func, *args):
+        if not spellcheck_executor.try_acquire():
+            raise ServerBusy()
+        try:
+            return await spellcheck_executor.run(_run_with_db, func, *args)
+        finally:
+            spellcheck_executor.release()
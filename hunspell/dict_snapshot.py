@@ -0,0 +1,152 @@
+import gc
+import hashlib
+import os
+import pickle
+from importlib.metadata import version, PackageNotFoundError
+from pathlib import Path
+
+from django.conf import settings
+from spylls.hunspell import Dictionary
+
+# Bump whenever the on-disk layout of a snapshot changes
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = '.snapshot'
+
+try:
+    SPYLLS_VERSION = version('spylls')
+except PackageNotFoundError:
+    SPYLLS_VERSION = 'unknown'
+
+
+def get_snapshot_dir():
+    default_dir = Path(__file__).resolve().parent.parent / 'dict_snapshots'
+    return Path(getattr(settings, 'DICT_SNAPSHOT_DIR', default_dir))
+
+
+def snapshot_path(dict_path, suffix=SNAPSHOT_SUFFIX):
+    """
+    Location of a compiled artifact for a dictionary base path
+    (e.g. ``hunspell/dicts/en_US/en_US`` -> ``dict_snapshots/en_US__en_US.snapshot``)
+    """
+    dict_path = Path(dict_path)
+    return get_snapshot_dir() / f"{dict_path.parent.name}__{dict_path.name}{suffix}"
+
+
+def source_fingerprint(dict_path):
+    """
+    Content hash of the .aff/.dic pair, used to detect stale snapshots
+    and as the dictionary version elsewhere
+    """
+    digest = hashlib.sha256()
+    for suffix in ('.aff', '.dic'):
+        with open(f"{dict_path}{suffix}", 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _header(fingerprint):
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'spylls': SPYLLS_VERSION,
+        'source': fingerprint,
+    }
+
+
+def read_artifact(path, fingerprint):
+    """
+    Load a pickled artifact written by :func:`write_artifact`.
+
+    Returns:
+        The stored object, or None when the file is missing, unreadable, or
+        was built from different source files / another spylls version
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            header = pickle.load(f)
+            if header != _header(fingerprint):
+                print(f"Snapshot {path} is stale, ignoring it")
+                return None
+            # Unpickling creates hundreds of thousands of small objects; the cyclic
+            # GC would otherwise run many times over them for nothing
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(f)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+    except Exception as e:
+        print(f"Error loading snapshot {path}: {str(e)}")
+        return None
+
+
+def write_artifact(path, obj, fingerprint):
+    """
+    Pickle ``obj`` behind a header identifying its source files. The file is
+    written to a temporary name and renamed, so concurrent readers never see
+    a partial file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(_header(fingerprint), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
+
+
+def load_snapshot(dict_path, fingerprint=None):
+    """
+    Load a compiled Dictionary for ``dict_path`` if a valid snapshot exists.
+
+    Returns:
+        Dictionary or None: None when the snapshot is missing or stale
+    """
+    path = snapshot_path(dict_path)
+    if not path.exists():
+        return None
+
+    if fingerprint is None:
+        fingerprint = source_fingerprint(dict_path)
+    return read_artifact(path, fingerprint)
+
+
+def write_snapshot(dict_path, dictionary, fingerprint=None):
+    """
+    Compile ``dictionary`` (already loaded from ``dict_path``) to its snapshot file.
+    """
+    if fingerprint is None:
+        fingerprint = source_fingerprint(dict_path)
+    return write_artifact(snapshot_path(dict_path), dictionary, fingerprint)
+
+
+def load_dictionary(dict_path):
+    """
+    Load a Dictionary, preferring the compiled snapshot and falling back to
+    parsing the .aff/.dic text files (refreshing the snapshot when enabled).
+
+    Returns:
+        tuple: (Dictionary, source fingerprint)
+    """
+    fingerprint = source_fingerprint(dict_path)
+    dictionary = load_snapshot(dict_path, fingerprint)
+    if dictionary is not None:
+        return dictionary, fingerprint
+
+    dictionary = Dictionary.from_files(str(dict_path))
+    if getattr(settings, 'DICT_SNAPSHOT_AUTOWRITE', True):
+        try:
+            write_snapshot(dict_path, dictionary, fingerprint)
+        except Exception as e:
+            print(f"Error writing snapshot for {dict_path}: {str(e)}")
+    return dictionary, fingerprint
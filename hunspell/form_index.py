@@ -0,0 +1,109 @@
+import sys
+
+from django.conf import settings
+
+from .dict_snapshot import read_artifact, snapshot_path, write_artifact
+
+FORM_INDEX_SUFFIX = '.forms'
+
+
+class FormIndexTooLarge(Exception):
+    pass
+
+
+def form_index_path(dict_path):
+    return snapshot_path(dict_path, FORM_INDEX_SUFFIX)
+
+
+def _apply_suffix(stem, suffix):
+    if not stem.endswith(suffix.strip) or not suffix.cond_regexp.search(stem):
+        return None
+    return stem[:len(stem) - len(suffix.strip)] + suffix.add
+
+
+def _apply_prefix(stem, prefix):
+    if not stem.startswith(prefix.strip) or not prefix.cond_regexp.search(stem):
+        return None
+    return prefix.add + stem[len(prefix.strip):]
+
+
+def expand_forms(dictionary):
+    """
+    Candidate surface forms of every .dic stem: the stem itself, each applicable
+    prefix and suffix, and cross-product prefix+suffix combinations.
+
+    Candidates are not guaranteed to be valid (forbidden words, NEEDAFFIX stems,
+    ONLYINCOMPOUND forms...), see :func:`build_form_index`.
+    """
+    aff = dictionary.aff
+    for word in dictionary.dic.words:
+        stem = word.stem
+        yield stem
+
+        suffixed = []
+        prefixes = []
+        for flag in word.flags:
+            for suffix in aff.SFX.get(flag, ()):
+                form = _apply_suffix(stem, suffix)
+                if form is not None:
+                    suffixed.append((suffix, form))
+                    yield form
+            for prefix in aff.PFX.get(flag, ()):
+                form = _apply_prefix(stem, prefix)
+                if form is not None:
+                    prefixes.append(prefix)
+                    yield form
+
+        for suffix, form in suffixed:
+            if not suffix.crossproduct:
+                continue
+            for prefix in prefixes:
+                if prefix.crossproduct:
+                    cross_form = _apply_prefix(form, prefix)
+                    if cross_form is not None:
+                        yield cross_form
+
+
+def build_form_index(dictionary, max_forms=None):
+    """
+    Expand a dictionary into the set of surface forms that spylls accepts as-is.
+
+    Every candidate from :func:`expand_forms` is confirmed with ``lookup()``, so a
+    form in the index is always one ``check_text`` would accept; anything missing
+    (compounds, twofold affixes, case variants) is still answered by spylls.
+
+    Raises:
+        FormIndexTooLarge: If the language expands to more than ``max_forms`` candidates
+    """
+    if max_forms is None:
+        max_forms = getattr(settings, 'SPELLCHECK_FORM_INDEX_MAX_FORMS', 2000000)
+
+    candidates = set()
+    for form in expand_forms(dictionary):
+        candidates.add(form)
+        if len(candidates) > max_forms:
+            raise FormIndexTooLarge(f"More than {max_forms} candidate forms")
+
+    return frozenset(form for form in candidates if dictionary.lookup(form))
+
+
+def load_form_index(dict_path, fingerprint):
+    """
+    Returns:
+        frozenset or None: The prebuilt form index, or None if missing or stale
+    """
+    path = form_index_path(dict_path)
+    if not path.exists():
+        return None
+    return read_artifact(path, fingerprint)
+
+
+def write_form_index(dict_path, forms, fingerprint):
+    return write_artifact(form_index_path(dict_path), forms, fingerprint)
+
+
+def form_index_size(forms):
+    """
+    Approximate memory used by a form index in bytes
+    """
+    return sys.getsizeof(forms) + sum(sys.getsizeof(form) for form in forms)
@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from hunspell.benchmark import benchmark_language, compare, config_languages, environment
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark dictionary load time, peak memory, check throughput and suggestion latency '
+        'per language, optionally comparing with an earlier run'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'languages',
+            nargs='*',
+            help='Language codes to benchmark (defaults to every language in dicts_config)'
+        )
+        parser.add_argument('--output', help='Write the results as JSON to this file instead of stdout')
+        parser.add_argument('--baseline', help='JSON results of an earlier run to compare with')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=20.0,
+            help='Percent change in the bad direction reported as a regression (default 20)'
+        )
+        parser.add_argument('--corpus-size', type=int, default=2000, help='Valid and invalid words checked')
+        parser.add_argument('--suggest-samples', type=int, default=20, help='Misspellings timed for suggestions')
+        parser.add_argument('--rounds', type=int, default=3, help='Check passes per corpus; the fastest is kept')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for sampling the corpus')
+        # Internal: measure one language in this process and write its metrics to a file
+        parser.add_argument('--worker', help=argparse.SUPPRESS)
+        parser.add_argument('--worker-output', help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            result = benchmark_language(
+                options['worker'],
+                corpus_size=options['corpus_size'],
+                suggest_samples=options['suggest_samples'],
+                check_rounds=options['rounds'],
+                seed=options['seed'],
+            )
+            with open(options['worker_output'], 'w') as f:
+                json.dump(result, f)
+            return
+
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline'], 'r') as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read baseline {options['baseline']}: {str(e)}")
+
+        results = {**environment(), 'languages': {}}
+        for lang_code in options['languages'] or config_languages():
+            results['languages'][lang_code] = self._run_worker(lang_code, options)
+
+        regressions = []
+        if baseline is not None:
+            results['comparison'] = compare(results, baseline, options['threshold'] / 100)
+            regressions = [row for row in results['comparison'] if row['regression']]
+
+        output = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        for row in regressions:
+            self.stderr.write(self.style.ERROR(
+                f"{row['language']} {row['metric']}: {row['baseline']} -> {row['current']} "
+                f"({row['change']:+.1%})"
+            ))
+        if regressions:
+            raise CommandError(f"{len(regressions)} metric(s) regressed by more than {options['threshold']}%")
+
+    def _run_worker(self, lang_code, options):
+        # A fresh process per language, so peak RSS and load time are its own
+        fd, worker_output = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        command = [
+            sys.executable, '-m', 'django', 'benchmark_spellchecker',
+            '--worker', lang_code,
+            '--worker-output', worker_output,
+            '--corpus-size', str(options['corpus_size']),
+            '--suggest-samples', str(options['suggest_samples']),
+            '--rounds', str(options['rounds']),
+            '--seed', str(options['seed']),
+        ]
+        try:
+            self.stderr.write(f"{lang_code}: benchmarking...")
+            completed = subprocess.run(
+                command,
+                cwd=settings.BASE_DIR,
+                env={**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings')},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            if completed.returncode != 0:
+                error = completed.stderr.strip().splitlines()[-1:] or ['worker failed']
+                self.stderr.write(self.style.ERROR(f"{lang_code}: {error[0]}"))
+                return {'error': error[0]}
+            with open(worker_output, 'r') as f:
+                return json.load(f)
+        finally:
+            os.remove(worker_output)
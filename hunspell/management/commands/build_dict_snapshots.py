@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hunspell.check_spell import SpellChecker
+from hunspell.dict_snapshot import load_snapshot, source_fingerprint, write_snapshot
+from spylls.hunspell import Dictionary
+
+
+class Command(BaseCommand):
+    help = 'Compile .aff/.dic dictionaries into binary snapshots for fast SpellChecker cold start'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'languages',
+            nargs='*',
+            help='Language codes to compile (defaults to all supported languages)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild snapshots even if they are up to date'
+        )
+
+    def handle(self, *args, **options):
+        languages = options['languages'] or sorted(SpellChecker.SUPPORTED_LANGUAGES)
+        failed = 0
+
+        for lang_code in languages:
+            try:
+                dict_path = SpellChecker.find_dict_path(lang_code)
+                fingerprint = source_fingerprint(dict_path)
+
+                if not options['force'] and load_snapshot(dict_path, fingerprint) is not None:
+                    self.stdout.write(f"{lang_code}: up to date")
+                    continue
+
+                start = time.perf_counter()
+                dictionary = Dictionary.from_files(str(dict_path))
+                path = write_snapshot(dict_path, dictionary, fingerprint)
+                elapsed = time.perf_counter() - start
+                self.stdout.write(self.style.SUCCESS(f"{lang_code}: wrote {path} in {elapsed:.2f}s"))
+            except Exception as e:
+                failed += 1
+                self.stderr.write(self.style.ERROR(f"{lang_code}: {str(e)}"))
+
+        if failed:
+            self.stderr.write(self.style.WARNING(f"{failed} language(s) failed"))
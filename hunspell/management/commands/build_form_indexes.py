@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hunspell.check_spell import SpellChecker
+from hunspell.dict_snapshot import load_dictionary
+from hunspell.form_index import FormIndexTooLarge, build_form_index, load_form_index, write_form_index
+
+
+class Command(BaseCommand):
+    help = 'Expand dictionaries into exact-form indexes used as a lookup fast path by SpellChecker'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'languages',
+            nargs='*',
+            help='Language codes to expand (defaults to all supported languages)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild indexes even if they are up to date'
+        )
+        parser.add_argument(
+            '--max-forms',
+            type=int,
+            default=None,
+            help='Skip languages expanding to more candidate forms than this'
+        )
+
+    def handle(self, *args, **options):
+        languages = options['languages'] or sorted(SpellChecker.SUPPORTED_LANGUAGES)
+        failed = 0
+
+        for lang_code in languages:
+            try:
+                dict_path = SpellChecker.find_dict_path(lang_code)
+                dictionary, fingerprint = load_dictionary(dict_path)
+
+                if not options['force'] and load_form_index(dict_path, fingerprint) is not None:
+                    self.stdout.write(f"{lang_code}: up to date")
+                    continue
+
+                start = time.perf_counter()
+                forms = build_form_index(dictionary, max_forms=options['max_forms'])
+                path = write_form_index(dict_path, forms, fingerprint)
+                elapsed = time.perf_counter() - start
+                self.stdout.write(self.style.SUCCESS(
+                    f"{lang_code}: wrote {len(forms)} forms to {path} in {elapsed:.2f}s"
+                ))
+            except FormIndexTooLarge as e:
+                self.stdout.write(self.style.WARNING(f"{lang_code}: skipped, {str(e)}"))
+            except Exception as e:
+                failed += 1
+                self.stderr.write(self.style.ERROR(f"{lang_code}: {str(e)}"))
+
+        if failed:
+            self.stderr.write(self.style.WARNING(f"{failed} language(s) failed"))
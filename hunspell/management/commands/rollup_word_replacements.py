@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from hunspell.models import RollupWatermark, WordReplacementDailyRollup
+from hunspell.services.replacement_rollup_service import ROLLUP_NAME, ReplacementRollupService
+
+
+class Command(BaseCommand):
+    help = 'Fold new WordReplacement rows into the daily replacement rollup used by the analytics endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100000,
+            help='Source rows (by id) aggregated per transaction'
+        )
+        parser.add_argument(
+            '--lag',
+            type=int,
+            default=60,
+            help='Leave rows younger than this many seconds for the next run'
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Drop the rollup and rebuild it from every row'
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            with transaction.atomic():
+                WordReplacementDailyRollup.objects.all().delete()
+                RollupWatermark.objects.filter(name=ROLLUP_NAME).delete()
+            self.stdout.write("Cleared the rollup")
+
+        start = time.perf_counter()
+        stats = ReplacementRollupService.roll_up(batch_size=options['batch_size'], lag_seconds=options['lag'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Folded {stats['rows']} rows into {stats['keys']} rollup keys in {stats['batches']} batch(es) "
+            f"in {elapsed:.2f}s, watermark at id {stats['last_id']}"
+        ))
@@ -0,0 +1,111 @@
+"""
+Prometheus metrics for the spell-check hot path, served at /metrics.
+
+Under gunicorn every worker (and suggestion pool process) writes its samples to
+PROMETHEUS_MULTIPROC_DIR, which gunicorn.conf.py sets up before the app is imported,
+and /metrics adds them up across processes. Live gauges of exited processes are dropped
+by mark_process_dead, or by mark_exited_processes for the ones gunicorn doesn't track. Without that variable (runserver,
+management commands) the metrics only cover the current process.
+"""
+import glob
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+
+CHECK_SECONDS = Histogram(
+    'hunspell_check_batch_seconds',
+    "Time to check one request's words with SpellChecker.check_many (see hunspell_request_words for the sizes)",
+    ['language'],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+SUGGEST_SECONDS = Histogram(
+    'hunspell_suggest_seconds',
+    'Time to compute suggestions for one word with SpellChecker.get_suggestions',
+    ['language'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DICTIONARY_LOAD_SECONDS = Histogram(
+    'hunspell_dictionary_load_seconds',
+    'Time to load a dictionary, from a snapshot or from the .aff/.dic files',
+    ['language'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+DICTIONARIES_LOADED = Gauge(
+    'hunspell_dictionaries_loaded',
+    'Dictionaries currently loaded, summed over live processes',
+    ['language'],
+    multiprocess_mode='livesum',
+)
+DICTIONARY_ESTIMATED_BYTES = Gauge(
+    'hunspell_dictionary_estimated_bytes',
+    'Estimated memory of loaded dictionaries, summed over live processes',
+    ['language'],
+    multiprocess_mode='livesum',
+)
+LANGUAGE_FALLBACKS = Counter(
+    'hunspell_language_fallbacks',
+    "SpellChecker instances that fell back to en_US, by requested language ('unsupported' for unknown codes)",
+    ['language', 'reason'],
+)
+REQUEST_WORDS = Histogram(
+    'hunspell_request_words',
+    'Words per check or suggestion request',
+    ['endpoint'],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000),
+)
+LOOKUP_CACHE = Counter(
+    'hunspell_lookup_cache_requests',
+    'Word lookups answered from (hit) or added to (miss) the per-language lookup cache',
+    ['language', 'result'],
+)
+SUGGESTION_CACHE = Counter(
+    'hunspell_suggestion_cache_requests',
+    'Suggestion cache reads by result',
+    ['language', 'result'],
+)
+
+
+def render():
+    """
+    Returns:
+        bytes: Every metric in the Prometheus text format, aggregated over all processes
+               when PROMETHEUS_MULTIPROC_DIR is set
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead(pid):
+    """
+    Drop the live gauges of a process that exited, so they stop counting towards the totals
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
+
+
+def mark_exited_processes():
+    """
+    Drop the live gauges of every process that is no longer running, e.g. suggestion pool
+    processes of a recycled worker, which gunicorn doesn't report through child_exit
+    """
+    metrics_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if not metrics_dir:
+        return
+    pids = set()
+    for path in glob.glob(os.path.join(metrics_dir, 'gauge_live*_*.db')):
+        try:
+            pids.add(int(os.path.basename(path)[:-len('.db')].rsplit('_', 1)[1]))
+        except ValueError:
+            continue
+    for pid in pids:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            multiprocess.mark_process_dead(pid, metrics_dir)
+        except PermissionError:
+            # Running, under another user
+            pass
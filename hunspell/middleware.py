@@ -0,0 +1,162 @@
+import cProfile
+import json
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .check_spell import SpellChecker
+from .permissions import is_admin_user
+from .services.request_profile_service import request_profiles
+from .views import SpellCheckerView, SpellCorrectionView
+
+
+class RequestProfilingMiddleware:
+    """
+    Profile one check or suggestion request with cProfile when an admin asks for it
+    with an ``X-Profile: 1`` header or ``?profile=1``. The profile is stored (see
+    RequestProfileService) and its id returned in the ``X-Profile-Id`` response header;
+    everyone else's flag is ignored.
+
+    Works in both sync and async middleware chains; under ASGI only flagged requests
+    are handed to a thread for the admin check and the profiled view.
+
+    Only work done in the request's thread is captured: suggestions computed in the
+    suggestion process pool (SUGGESTION_POOL_WORKERS) show up as time spent waiting.
+    """
+
+    PROFILED_VIEWS = {
+        SpellCheckerView: 'check',
+        SpellCorrectionView: 'suggest',
+    }
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django runs a sync process_view in a thread under ASGI; stay async so that
+            # unflagged requests don't pay for the hop
+            self.process_view = self._aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = self._flagged_view(request, view_func)
+        if view_name is None:
+            return None
+        return self._profile_view(request, view_name, view_func, view_args, view_kwargs)
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        view_name = self._flagged_view(request, view_func)
+        if view_name is None:
+            return None
+        # The admin check and the (sync) view use the database
+        return await sync_to_async(self._profile_view)(request, view_name, view_func, view_args, view_kwargs)
+
+    def _flagged_view(self, request, view_func):
+        view_name = self.PROFILED_VIEWS.get(getattr(view_func, 'view_class', None))
+        if view_name is None or not getattr(settings, 'PROFILING_ENABLED', True):
+            return None
+        return view_name if self._profile_requested(request) else None
+
+    def _profile_view(self, request, view_name, view_func, view_args, view_kwargs):
+        if not self._is_admin(request):
+            return None
+
+        lang_code, words = self._describe(request)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = view_func(request, *view_args, **view_kwargs)
+            # DRF responses are rendered later by the handler; do it here so it is measured too
+            if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                response = response.render()
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+
+        if getattr(response, 'streaming', False):
+            # Streamed suggestions are computed while the body is sent; keep profiling until then
+            profile_stream = self._profile_async_stream if response.is_async else self._profile_stream
+            response.streaming_content = profile_stream(
+                response.streaming_content, profiler, elapsed, view_name, lang_code, request.path, words
+            )
+            return response
+
+        profile_id = request_profiles.save(profiler, view_name, lang_code, elapsed, request.path, words)
+        response['X-Profile-Id'] = profile_id
+        return response
+
+    @staticmethod
+    def _profile_stream(chunks, profiler, elapsed, view_name, lang_code, path, words):
+        iterator = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                chunk = next(iterator, None)
+            finally:
+                profiler.disable()
+                elapsed += time.perf_counter() - start
+            if chunk is None:
+                break
+            yield chunk
+        profile_id = request_profiles.save(profiler, view_name, lang_code, elapsed, path, words)
+        print(f"Stored profile {profile_id} of streamed {view_name} request")
+
+    @staticmethod
+    async def _profile_async_stream(chunks, profiler, elapsed, view_name, lang_code, path, words):
+        # Under ASGI the chunks are produced in worker threads, which cProfile doesn't follow:
+        # the profile covers the view itself, the duration the whole stream
+        start = time.perf_counter()
+        async for chunk in chunks:
+            yield chunk
+        elapsed += time.perf_counter() - start
+        profile_id = await sync_to_async(request_profiles.save)(profiler, view_name, lang_code, elapsed, path, words)
+        print(f"Stored profile {profile_id} of streamed {view_name} request")
+
+    @staticmethod
+    def _profile_requested(request):
+        flag = request.headers.get('X-Profile') or request.GET.get('profile')
+        return flag in ('1', 'true', 'True')
+
+    @staticmethod
+    def _is_admin(request):
+        # JWT authentication normally happens inside the DRF view, after this middleware
+        user = request.user if getattr(request, 'user', None) and request.user.is_authenticated else None
+        if user is None:
+            try:
+                authenticated = JWTAuthentication().authenticate(request)
+            except AuthenticationFailed:
+                return False
+            if authenticated is None:
+                return False
+            user = authenticated[0]
+        return is_admin_user(user)
+
+    @staticmethod
+    def _describe(request):
+        try:
+            data = json.loads(request.body or b'{}')
+        except (ValueError, UnicodeDecodeError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        language = data.get('language', 'en_US')
+        words = data.get('words')
+        # Keeps arbitrary client input out of the report's language list
+        if language not in SpellChecker.SUPPORTED_LANGUAGES:
+            language = 'unsupported'
+        return language, len(words) if isinstance(words, list) else None
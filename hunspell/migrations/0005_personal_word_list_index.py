@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hunspell', '0004_wordreplacement_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='personaldictionary',
+            index=models.Index(fields=['user', 'lang_code', 'word_type', 'created_at', 'id'], name='personal_word_list_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hunspell', '0005_personal_word_list_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wordreplacement',
+            index=models.Index(fields=['lang_code', 'id'], name='word_replacement_lang_idx'),
+        ),
+    ]
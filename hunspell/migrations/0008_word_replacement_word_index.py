@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hunspell', '0007_word_replacement_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wordreplacement',
+            index=models.Index(fields=['lang_code', 'original_word'], name='word_replacement_word_idx'),
+        ),
+    ]
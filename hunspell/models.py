@@ -19,6 +19,10 @@ class PersonalDictionary(models.Model):
 
     class Meta:
         unique_together = ['user', 'word', 'lang_code', 'word_type']
+        indexes = [
+            # Serves the paginated word lists: one user's words of one type and language, oldest first
+            models.Index(fields=['user', 'lang_code', 'word_type', 'created_at', 'id'], name='personal_word_list_idx'),
+        ]
         verbose_name_plural = "Personal dictionaries"
 
     def __str__(self):
@@ -33,6 +37,44 @@ class WordReplacement(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Serves the per-language pages of the replacements export (newest first by id)
+            models.Index(fields=['lang_code', 'id'], name='word_replacement_lang_idx'),
+            # Lets the replacement history recount only the words that got new replacements
+            models.Index(fields=['lang_code', 'original_word'], name='word_replacement_word_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.original_word} -> {self.replacement_word} ({self.lang_code})" 
\ No newline at end of file
+        return f"{self.original_word} -> {self.replacement_word} ({self.lang_code})"
+
+
+class WordReplacementDailyRollup(models.Model):
+    """
+    Number of times ``original_word`` was replaced with ``replacement_word`` per language and day,
+    maintained incrementally from WordReplacement by the rollup_word_replacements command
+    """
+    lang_code = models.CharField(max_length=10)
+    original_word = models.CharField(max_length=100)
+    replacement_word = models.CharField(max_length=100)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['lang_code', 'original_word', 'replacement_word', 'day']
+        indexes = [
+            models.Index(fields=['lang_code', 'day'], name='replacement_rollup_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.original_word} -> {self.replacement_word} ({self.lang_code}): {self.count}"
+
+class RollupWatermark(models.Model):
+    """
+    Highest source row id already folded into a rollup, so each run only reads newer rows
+    """
+    name = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_id}"
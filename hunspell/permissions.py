@@ -0,0 +1,37 @@
+import os
+
+from rest_framework.permissions import BasePermission
+
+
+def get_admin_emails():
+    """
+    Emails listed in the comma-separated ADMIN_EMAIL environment variable.
+
+    Returns:
+        set: Stripped, non-empty addresses (empty if the variable is unset)
+    """
+    return {email.strip() for email in os.getenv('ADMIN_EMAIL', '').split(',') if email.strip()}
+
+
+def is_admin_user(user):
+    """
+    Whether a user is an admin, i.e. has a non-empty email listed in ADMIN_EMAIL.
+
+    Args:
+        user: Django user, possibly anonymous
+
+    Returns:
+        bool: True for admins
+    """
+    email = getattr(user, 'email', '') or ''
+    return bool(email) and email in get_admin_emails()
+
+
+class IsAdminEmail(BasePermission):
+    """
+    Allows access only to authenticated users whose email is listed in ADMIN_EMAIL
+    """
+    message = "Permission denied. Unauthorized user."
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and is_admin_user(request.user))
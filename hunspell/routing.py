@@ -0,0 +1,6 @@
+from django.urls import path
+from .consumers import LiveCheckConsumer
+
+websocket_urlpatterns = [
+    path('ws/live-check/', LiveCheckConsumer.as_asgi()),
+]
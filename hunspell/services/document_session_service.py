@@ -0,0 +1,373 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from ..shared_cache import get_shared_cache
+from .personal_word_overlay_service import personal_word_overlay
+from .spell_check_service import spell_checker_service
+
+
+class RevisionMismatch(ValidationError):
+    def __init__(self, detail=None, code=None, expected_revision=None):
+        super().__init__(detail, code)
+        self.expected_revision = expected_revision
+
+
+class DocumentTooLarge(ValidationError):
+    pass
+
+
+class DocumentBusy(Exception):
+    pass
+
+
+class DocumentSession:
+    """
+    Server-side copy of one document being edited in one language.
+
+    Clients send edits (replace ``[start, end)`` with ``text``, code point offsets)
+    instead of the whole document. The misspellings found at the current revision are
+    kept, so an edit only re-tokenizes and re-checks the words around it and the rest
+    of the results are shifted into place.
+    """
+
+    def __init__(self, language, text='', revision=0, owner_id=None):
+        self.language = language
+        self.text = text
+        self.revision = revision
+        self.owner_id = owner_id
+        self.document_id = uuid.uuid4().hex
+        # Misspelled (word, start, end) tokens at ``revision``, sorted by start; None until checked
+        self.misspellings = None
+        self.last_access = time.monotonic()
+        self._lock = threading.Lock()
+
+    def check_all(self):
+        """
+        Check the whole document and store the results for the current revision
+
+        Returns:
+            list: Misspelled (word, start, end) tokens
+        """
+        with self._lock:
+            self.misspellings = self.check_range(0, len(self.text))
+            return self.misspellings
+
+    def results(self):
+        """
+        Returns:
+            tuple: (revision, misspellings) read together so they always match
+        """
+        with self._lock:
+            return self.revision, self.misspellings
+
+    def to_state(self):
+        """
+        Returns:
+            dict: Everything needed to rebuild the session in another process, see ``from_state``
+        """
+        with self._lock:
+            return {
+                "document_id": self.document_id,
+                "language": self.language,
+                "text": self.text,
+                "revision": self.revision,
+                "owner_id": self.owner_id,
+                "misspellings": self.misspellings,
+            }
+
+    @classmethod
+    def from_state(cls, state):
+        session = cls(state["language"], state["text"], state["revision"], state["owner_id"])
+        session.document_id = state["document_id"]
+        session.misspellings = state["misspellings"]
+        return session
+
+    def edit(self, revision, changes):
+        """
+        Apply edits and re-check only the words they touch
+
+        Args:
+            revision: The document revision after these edits
+            changes: List of {"start", "end", "text"} dicts, see ``apply_edits``
+
+        Returns:
+            tuple: (start, end, misspellings) where ``misspellings`` replace every
+                   earlier result inside ``[start, end)`` of the new text
+
+        Raises:
+            RevisionMismatch, DocumentTooLarge, ValidationError: See ``apply_edits``
+        """
+        with self._lock:
+            old_length = len(self.text)
+            start, end = self.apply_edits(revision, changes)
+            misspelled = self.check_range(start, end)
+
+            if self.misspellings is not None:
+                # Text outside [start, end) is untouched: tokens before it keep their offsets,
+                # tokens after it move by however much the document grew or shrank
+                shift = len(self.text) - old_length
+                old_end = end - shift
+                self.misspellings = [
+                    *(token for token in self.misspellings if token[2] <= start),
+                    *misspelled,
+                    *(
+                        (word, word_start + shift, word_end + shift)
+                        for word, word_start, word_end in self.misspellings
+                        if word_start >= old_end
+                    ),
+                ]
+            return start, end, misspelled
+
+    def apply_edits(self, revision, changes):
+        """
+        Apply a batch of edits that takes the document from ``revision - 1`` to ``revision``
+
+        Args:
+            revision: The document revision after these edits
+            changes: List of {"start", "end", "text"} dicts, applied in order, each
+                     relative to the text produced by the previous one
+
+        Returns:
+            tuple: (start, end) of the text that needs re-checking, in the new text
+
+        Raises:
+            RevisionMismatch: If ``revision`` doesn't follow the session's revision
+            DocumentTooLarge: If the edited text is longer than SPELLCHECK_MAX_TEXT_LENGTH
+            ValidationError: If a change is malformed or out of range
+        """
+        if revision != self.revision + 1:
+            raise RevisionMismatch(
+                f"Expected revision {self.revision + 1}, got {revision}",
+                expected_revision=self.revision + 1
+            )
+
+        text = self.text
+        dirty_start = dirty_end = None
+        for change in changes:
+            start, end, new_text = self._validate_change(change, len(text))
+            text = text[:start] + new_text + text[end:]
+
+            if dirty_start is None:
+                dirty_start, dirty_end = start, start + len(new_text)
+            else:
+                # Carry the dirty range over to the edited text, then widen it to cover this edit
+                dirty_start = self._map_offset(dirty_start, start, end, new_text, toward_end=False)
+                dirty_end = self._map_offset(dirty_end, start, end, new_text, toward_end=True)
+                dirty_start = min(dirty_start, start)
+                dirty_end = max(dirty_end, start + len(new_text))
+
+        max_length = getattr(settings, 'SPELLCHECK_MAX_TEXT_LENGTH', 1000000)
+        if len(text) > max_length:
+            raise DocumentTooLarge(f"Text is longer than {max_length} characters")
+
+        self.text = text
+        self.revision = revision
+        if dirty_start is None:
+            return 0, 0
+        return self._expand_to_words(dirty_start, dirty_end)
+
+    @staticmethod
+    def _map_offset(offset, start, end, new_text, toward_end):
+        # Where ``offset`` lands after ``[start, end)`` is replaced with ``new_text``
+        if offset <= start:
+            return offset
+        if offset >= end:
+            return offset + len(new_text) - (end - start)
+        return start + len(new_text) if toward_end else start
+
+    @staticmethod
+    def _validate_change(change, length):
+        if not isinstance(change, dict):
+            raise ValidationError("Each change must be an object")
+        start, end, new_text = change.get('start'), change.get('end'), change.get('text', '')
+        if not isinstance(start, int) or not isinstance(end, int) or not isinstance(new_text, str):
+            raise ValidationError("Each change needs integer start/end and a text string")
+        if not 0 <= start <= end <= length:
+            raise ValidationError(f"Change range {start}-{end} is outside the document")
+        return start, end, new_text
+
+    def _expand_to_words(self, start, end):
+        # Words never span whitespace, so widening to the surrounding whitespace
+        # covers every word the edit could have changed or merged
+        text = self.text
+        while start > 0 and not text[start - 1].isspace():
+            start -= 1
+        while end < len(text) and not text[end].isspace():
+            end += 1
+        return start, end
+
+    def check_range(self, start=0, end=None):
+        """
+        Returns:
+            list: Misspelled (word, start, end) tokens inside ``text[start:end]``,
+                  with offsets into the whole document
+        """
+        if end is None:
+            end = len(self.text)
+        # Looked up on every check so sessions don't keep evicted dictionaries alive
+        spell_checker = spell_checker_service.get_spell_checker(self.language)
+        personal_words = personal_word_overlay.get_user_words(self.owner_id, self.language)
+        misspelled, _ = spell_checker.find_misspellings(self.text[start:end], personal_words)
+        return [(word, start + word_start, start + word_end) for word, word_start, word_end in misspelled]
+
+
+class DocumentSessionService:
+    """
+    Store of open DocumentSessions, expired after DOCUMENT_SESSION_TTL seconds without
+    a request.
+
+    Sessions are kept in the cache named by DOCUMENT_SESSION_CACHE_ALIAS when it is a
+    Redis cache (see get_shared_cache), so an edit can be handled by any worker. Edits of
+    one document are serialized with a lock entry in the same cache, which relies on
+    Redis's atomic add(). Each edit then reads and writes the whole session, so its cost
+    grows with the document rather than the edit. Without Redis, sessions stay in this
+    worker's memory, bounded by DOCUMENT_SESSION_MAX_COUNT (least recently used sessions
+    are dropped first).
+    """
+
+    # Seconds an edit waits for another worker's edit of the same document
+    LOCK_WAIT = 5
+    # Seconds after which a lock left by a crashed worker is ignored
+    LOCK_TIMEOUT = 30
+
+    def __init__(self, max_sessions=None, ttl=None):
+        if max_sessions is None:
+            max_sessions = getattr(settings, 'DOCUMENT_SESSION_MAX_COUNT', 1000)
+        if ttl is None:
+            ttl = getattr(settings, 'DOCUMENT_SESSION_TTL', 30 * 60)
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        # Ordered from least to most recently used, only used without a shared cache
+        self.sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_cache():
+        return get_shared_cache(getattr(settings, 'DOCUMENT_SESSION_CACHE_ALIAS', None))
+
+    @staticmethod
+    def _session_key(document_id):
+        return f"document-session:{document_id}"
+
+    def create(self, language, text, revision=0, owner_id=None):
+        """
+        Open a session and check the whole text
+
+        Returns:
+            DocumentSession: The new session, with ``misspellings`` filled in
+        """
+        session = DocumentSession(language, text, revision, owner_id)
+        session.check_all()
+        cache = self._get_cache()
+        if cache is not None:
+            cache.set(self._session_key(session.document_id), session.to_state(), timeout=self.ttl)
+            return session
+
+        with self._lock:
+            self._expire()
+            self.sessions[session.document_id] = session
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+        return session
+
+    def get(self, document_id, owner_id=None):
+        """
+        Returns:
+            DocumentSession: The session, or None if it is unknown, expired or owned by someone else
+        """
+        cache = self._get_cache()
+        if cache is not None:
+            session = self._load(cache, document_id, owner_id)
+            if session is not None:
+                # Reading counts as activity, like for in-memory sessions
+                cache.touch(self._session_key(document_id), timeout=self.ttl)
+            return session
+
+        with self._lock:
+            self._expire()
+            session = self.sessions.get(document_id)
+            if session is None or session.owner_id != owner_id:
+                return None
+            session.last_access = time.monotonic()
+            self.sessions.move_to_end(document_id)
+            return session
+
+    def edit(self, document_id, owner_id, revision, changes):
+        """
+        Apply edits to a session, see ``DocumentSession.edit``
+
+        Returns:
+            tuple: (session, (start, end, misspellings)), or None if the session is
+                   unknown, expired or owned by someone else
+
+        Raises:
+            RevisionMismatch, DocumentTooLarge, ValidationError: See ``DocumentSession.apply_edits``
+            DocumentBusy: If another edit of the document didn't finish within LOCK_WAIT seconds
+        """
+        cache = self._get_cache()
+        if cache is None:
+            session = self.get(document_id, owner_id)
+            if session is None:
+                return None
+            return session, session.edit(revision, changes)
+
+        with self._locked(cache, document_id):
+            session = self._load(cache, document_id, owner_id)
+            if session is None:
+                return None
+            result = session.edit(revision, changes)
+            cache.set(self._session_key(document_id), session.to_state(), timeout=self.ttl)
+            return session, result
+
+    def close(self, document_id, owner_id=None):
+        cache = self._get_cache()
+        if cache is not None:
+            if self._load(cache, document_id, owner_id) is None:
+                return False
+            cache.delete(self._session_key(document_id))
+            return True
+
+        with self._lock:
+            session = self.sessions.get(document_id)
+            if session is None or session.owner_id != owner_id:
+                return False
+            del self.sessions[document_id]
+            return True
+
+    def _load(self, cache, document_id, owner_id):
+        state = cache.get(self._session_key(document_id))
+        if state is None or state["owner_id"] != owner_id:
+            return None
+        return DocumentSession.from_state(state)
+
+    @contextmanager
+    def _locked(self, cache, document_id):
+        # add() only succeeds for one caller, which makes the entry a lock across processes
+        key = f"{self._session_key(document_id)}:lock"
+        deadline = time.monotonic() + self.LOCK_WAIT
+        while not cache.add(key, 1, timeout=self.LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                raise DocumentBusy(f"Document {document_id} is being edited")
+            time.sleep(0.01)
+        try:
+            yield
+        finally:
+            cache.delete(key)
+
+    def _expire(self):
+        # The least recently used sessions come first, so stop at the first one still fresh
+        cutoff = time.monotonic() - self.ttl
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if session.last_access >= cutoff:
+                break
+            self.sessions.popitem(last=False)
+
+
+document_session_service = DocumentSessionService()
@@ -1,6 +1,208 @@
+import base64
+import json
+from collections import Counter
+from datetime import datetime
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import transaction
 from rest_framework.exceptions import ValidationError
 from ..models import PersonalDictionary
+from .personal_word_overlay_service import personal_word_overlay
+from .personal_words_version_service import personal_words_versions
+
+WORD_MAX_LENGTH = PersonalDictionary._meta.get_field('word').max_length
+
+def words_changed(user: User, lang_code: str, word_type: str):
+    """
+    Call after any write to a user's list: bumps its version (ETags, other workers'
+    overlays) and drops this worker's personal word overlay
+    """
+    personal_words_versions.bump(user.id, lang_code, word_type)
+    if word_type == 'dictionary':
+        personal_word_overlay.discard(user.id, lang_code)
+
+class InvalidCursor(ValidationError):
+    pass
+
+def _encode_cursor(created_at, pk) -> str:
+    payload = json.dumps([created_at.isoformat(), pk]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, pk = json.loads(payload)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursor("Invalid cursor")
+
+def get_words_page(user: User, lang_code: str, word_type: str, cursor: str = None, limit: int = None) -> tuple:
+    """
+    Get one page of the user's words, oldest first, using keyset pagination on
+    (created_at, id) so every page is a single index range scan
+    
+    Args:
+        user: The authenticated user
+        lang_code: Language code (e.g., 'en_US', 'de_DE')
+        word_type: 'dictionary' or 'starlist'
+        cursor: ``next_cursor`` from the previous page, or None for the first page
+        limit: Page size, defaults to PERSONAL_WORDS_PAGE_SIZE
+        
+    Returns:
+        tuple: (list of words, cursor for the next page or None on the last page)
+        
+    Raises:
+        InvalidCursor: If the cursor can't be decoded
+    """
+    if limit is None:
+        limit = getattr(settings, 'PERSONAL_WORDS_PAGE_SIZE', 1000)
+
+    queryset = PersonalDictionary.objects.filter(
+        user=user,
+        lang_code=lang_code,
+        word_type=word_type
+    )
+    if cursor:
+        created_at, pk = _decode_cursor(cursor)
+        queryset = queryset.filter(created_at__gte=created_at).exclude(created_at=created_at, id__lte=pk)
+
+    # One extra row tells whether there is a next page
+    rows = list(queryset.order_by('created_at', 'id').values_list('word', 'created_at', 'id')[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        _, created_at, pk = rows[-1]
+        next_cursor = _encode_cursor(created_at, pk)
+    return [word for word, _, _ in rows], next_cursor
+
+def _normalize_bulk_words(words: list) -> list:
+    """
+    Returns:
+        list: (input word, normalized word or None if invalid, status) per input word,
+              where status is None for words still to be processed
+    """
+    max_words = getattr(settings, 'PERSONAL_WORDS_BULK_MAX', 5000)
+    if len(words) > max_words:
+        raise ValidationError(f"At most {max_words} words can be sent at once")
+
+    entries = []
+    seen = set()
+    for word in words:
+        if not isinstance(word, str) or not word.strip() or len(word.strip()) > WORD_MAX_LENGTH:
+            entries.append((word, None, "invalid"))
+            continue
+        normalized = word.strip().lower()
+        if normalized in seen:
+            entries.append((word, normalized, "duplicate"))
+            continue
+        seen.add(normalized)
+        entries.append((word, normalized, None))
+    return entries
+
+def _bulk_results(entries: list, statuses: dict) -> dict:
+    results = [
+        {
+            "word": word,
+            "normalized": normalized,
+            "status": status or statuses[normalized]
+        }
+        for word, normalized, status in entries
+    ]
+    return {
+        "results": results,
+        "summary": dict(Counter(result["status"] for result in results))
+    }
+
+def bulk_add_words(user: User, words: list, lang_code: str, word_type: str) -> dict:
+    """
+    Add many words to one of the user's lists with a single lookup and a single insert
+    
+    Args:
+        user: The authenticated user
+        words: Words to add
+        lang_code: Language code (e.g., 'en_US', 'de_DE')
+        word_type: 'dictionary' or 'starlist'
+        
+    Returns:
+        dict: "results" with a status per input word ("added", "exists", "duplicate"
+              or "invalid") and a "summary" counting each status
+        
+    Raises:
+        ValidationError: If the language is missing or too many words are sent
+    """
+    if not lang_code:
+        raise ValidationError("Language must be specified")
+
+    entries = _normalize_bulk_words(words)
+    candidates = [normalized for _, normalized, status in entries if status is None]
+
+    with transaction.atomic():
+        existing = set(
+            PersonalDictionary.objects.filter(
+                user=user,
+                lang_code=lang_code,
+                word_type=word_type,
+                word__in=candidates
+            ).values_list('word', flat=True)
+        )
+        new_words = [word for word in candidates if word not in existing]
+        # ignore_conflicts covers words inserted concurrently since the lookup above
+        PersonalDictionary.objects.bulk_create(
+            [
+                PersonalDictionary(user=user, word=word, lang_code=lang_code, word_type=word_type)
+                for word in new_words
+            ],
+            batch_size=1000,
+            ignore_conflicts=True
+        )
+
+    if new_words:
+        words_changed(user, lang_code, word_type)
+
+    statuses = {word: "exists" for word in existing}
+    statuses.update((word, "added") for word in new_words)
+    return _bulk_results(entries, statuses)
+
+def bulk_remove_words(user: User, words: list, lang_code: str, word_type: str) -> dict:
+    """
+    Remove many words from one of the user's lists with a single lookup and a single delete
+    
+    Args:
+        user: The authenticated user
+        words: Words to remove
+        lang_code: Language code (e.g., 'en_US', 'de_DE')
+        word_type: 'dictionary' or 'starlist'
+        
+    Returns:
+        dict: "results" with a status per input word ("removed", "not_found",
+              "duplicate" or "invalid") and a "summary" counting each status
+        
+    Raises:
+        ValidationError: If the language is missing or too many words are sent
+    """
+    if not lang_code:
+        raise ValidationError("Language must be specified")
+
+    entries = _normalize_bulk_words(words)
+    candidates = [normalized for _, normalized, status in entries if status is None]
+
+    with transaction.atomic():
+        queryset = PersonalDictionary.objects.filter(
+            user=user,
+            lang_code=lang_code,
+            word_type=word_type,
+            word__in=candidates
+        )
+        existing = set(queryset.values_list('word', flat=True))
+        if existing:
+            queryset.delete()
+
+    if existing:
+        words_changed(user, lang_code, word_type)
+
+    statuses = {word: "not_found" for word in candidates}
+    statuses.update((word, "removed") for word in existing)
+    return _bulk_results(entries, statuses)
 
 class PersonalDictionaryService:
     @staticmethod
@@ -43,36 +245,32 @@ class PersonalDictionaryService:
             lang_code=lang_code,
             word_type='dictionary'
         )
+        words_changed(user, lang_code, 'dictionary')
         return True
 
     @staticmethod
-    def get_user_dictionary(user: User, lang_code: str) -> list:
+    def get_user_dictionary(user: User, lang_code: str, cursor: str = None, limit: int = None) -> tuple:
         """
-        Get all words in user's personal dictionary for a specific language
+        Get one page of words in user's personal dictionary for a specific language
         
         Args:
             user: The authenticated user
             lang_code: Language code (e.g., 'en_US', 'de_DE')
+            cursor: ``next_cursor`` from the previous page, or None for the first page
+            limit: Page size, defaults to PERSONAL_WORDS_PAGE_SIZE
             
         Returns:
-            list: List of words in user's dictionary for the specified language
+            tuple: (list of words, cursor for the next page or None on the last page)
             
         Raises:
             ValidationError: If dictionary doesn't exist for the specified language
+            InvalidCursor: If the cursor can't be decoded
         """
-        # First check if the language exists for this user
-        if not PersonalDictionary.objects.filter(
-            user=user, 
-            lang_code=lang_code,
-            word_type='dictionary'
-        ).exists():
+        words, next_cursor = get_words_page(user, lang_code, 'dictionary', cursor, limit)
+        # An empty first page means there is no dictionary, no separate exists() query needed
+        if not words and not cursor:
             raise ValidationError(f"No dictionary exists for language '{lang_code}'")
-        
-        return PersonalDictionary.objects.filter(
-            user=user,
-            lang_code=lang_code,
-            word_type='dictionary'
-        ).values_list('word', flat=True)
+        return words, next_cursor
 
     @staticmethod
     def remove_word(user: User, word: str, lang_code: str) -> bool:
@@ -98,8 +296,25 @@ class PersonalDictionaryService:
         ).delete()
         if result[0] == 0:
             raise ValidationError(f"Word not found in your {lang_code} dictionary")
+        # The delete isn't limited to one word type, so both lists may have changed
+        words_changed(user, lang_code, 'dictionary')
+        words_changed(user, lang_code, 'starlist')
         return True
 
+    @staticmethod
+    def add_words(user: User, words: list, lang_code: str) -> dict:
+        """
+        Add many words to user's personal dictionary at once, see ``bulk_add_words``
+        """
+        return bulk_add_words(user, words, lang_code, 'dictionary')
+
+    @staticmethod
+    def remove_words(user: User, words: list, lang_code: str) -> dict:
+        """
+        Remove many words from user's personal dictionary at once, see ``bulk_remove_words``
+        """
+        return bulk_remove_words(user, words, lang_code, 'dictionary')
+
     @staticmethod
     def get_user_languages(user: User) -> list:
         """
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import User
 from rest_framework.exceptions import ValidationError
 from ..models import PersonalDictionary
+from .personal_dictionary_service import bulk_add_words, bulk_remove_words, get_words_page, words_changed
 
 class PersonalStarlistService:
     @staticmethod
@@ -43,36 +44,32 @@ class PersonalStarlistService:
             lang_code=lang_code,
             word_type='starlist'
         )
+        words_changed(user, lang_code, 'starlist')
         return True
 
     @staticmethod
-    def get_user_starlist(user: User, lang_code: str) -> list:
+    def get_user_starlist(user: User, lang_code: str, cursor: str = None, limit: int = None) -> tuple:
         """
-        Get all words in user's personal starlist for a specific language
+        Get one page of words in user's personal starlist for a specific language
         
         Args:
             user: The authenticated user
             lang_code: Language code (e.g., 'en_US', 'de_DE')
+            cursor: ``next_cursor`` from the previous page, or None for the first page
+            limit: Page size, defaults to PERSONAL_WORDS_PAGE_SIZE
             
         Returns:
-            list: List of words in user's starlist for the specified language
+            tuple: (list of words, cursor for the next page or None on the last page)
             
         Raises:
             ValidationError: If starlist doesn't exist for the specified language
+            InvalidCursor: If the cursor can't be decoded
         """
-        # First check if the language exists for this user
-        if not PersonalDictionary.objects.filter(
-            user=user, 
-            lang_code=lang_code,
-            word_type='starlist'
-        ).exists():
+        words, next_cursor = get_words_page(user, lang_code, 'starlist', cursor, limit)
+        # An empty first page means there is no starlist, no separate exists() query needed
+        if not words and not cursor:
             raise ValidationError(f"No starlist exists for language '{lang_code}'")
-        
-        return PersonalDictionary.objects.filter(
-            user=user,
-            lang_code=lang_code,
-            word_type='starlist'
-        ).values_list('word', flat=True)
+        return words, next_cursor
 
     @staticmethod
     def remove_word(user: User, word: str, lang_code: str) -> bool:
@@ -98,8 +95,25 @@ class PersonalStarlistService:
         ).delete()
         if result[0] == 0:
             raise ValidationError(f"Word not found in your {lang_code} starlist")
+        # The delete isn't limited to one word type, so both lists may have changed
+        words_changed(user, lang_code, 'starlist')
+        words_changed(user, lang_code, 'dictionary')
         return True
 
+    @staticmethod
+    def add_words(user: User, words: list, lang_code: str) -> dict:
+        """
+        Add many words to user's personal starlist at once, see ``bulk_add_words``
+        """
+        return bulk_add_words(user, words, lang_code, 'starlist')
+
+    @staticmethod
+    def remove_words(user: User, words: list, lang_code: str) -> dict:
+        """
+        Remove many words from user's personal starlist at once, see ``bulk_remove_words``
+        """
+        return bulk_remove_words(user, words, lang_code, 'starlist')
+
     @staticmethod
     def get_user_languages(user: User) -> list:
         """
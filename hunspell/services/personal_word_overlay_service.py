@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from ..models import PersonalDictionary
+from .personal_words_version_service import personal_words_versions
+
+
+class PersonalWordOverlayService:
+    """
+    In-memory sets of each user's personal dictionary words, per (user, language),
+    so check and suggestion requests can accept them without a database query.
+
+    Sets are dropped locally when PersonalDictionaryService changes them. Other
+    workers notice through the list's version counter (see PersonalWordsVersionService),
+    which is read once per lookup; without one the words are read from the database
+    on every lookup.
+    """
+
+    def __init__(self, max_entries=None):
+        if max_entries is None:
+            max_entries = getattr(settings, 'PERSONAL_WORDS_CACHE_SIZE', 10000)
+        self.max_entries = max_entries
+        # (user id, language) -> (version, frozenset of words), least recently used first
+        self.overlays = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_words(self, user, lang_code):
+        """
+        Get the user's personal dictionary words for a language
+
+        Args:
+            user: The request user (anonymous users have no personal words)
+            lang_code: Language code (e.g., 'en_US', 'de_DE')
+
+        Returns:
+            frozenset: Lower-cased personal words, empty for anonymous users
+        """
+        if user is None or not user.is_authenticated:
+            return frozenset()
+        return self.get_user_words(user.id, lang_code)
+
+    def get_user_words(self, user_id, lang_code):
+        """
+        Same as ``get_words`` for a user id, e.g. one remembered by a document session
+        """
+        if user_id is None:
+            return frozenset()
+
+        key = (user_id, lang_code)
+        version = personal_words_versions.get(user_id, lang_code, 'dictionary')
+        if version is None:
+            # Nothing would tell this worker about changes made through another one
+            return self._load_words(user_id, lang_code)
+        with self._lock:
+            entry = self.overlays.get(key)
+            if entry is not None and entry[0] == version:
+                self.overlays.move_to_end(key)
+                return entry[1]
+
+        # Loaded outside the lock; the version was read first so a change made meanwhile
+        # leaves this entry stale and it is reloaded on the next request
+        words = self._load_words(user_id, lang_code)
+        with self._lock:
+            self.overlays[key] = (version, words)
+            self.overlays.move_to_end(key)
+            while len(self.overlays) > self.max_entries:
+                self.overlays.popitem(last=False)
+        return words
+
+    @staticmethod
+    def _load_words(user_id, lang_code):
+        return frozenset(
+            PersonalDictionary.objects.filter(
+                user_id=user_id,
+                lang_code=lang_code,
+                word_type='dictionary'
+            ).values_list('word', flat=True)
+        )
+
+    def discard(self, user_id, lang_code):
+        """
+        Drop this worker's copy of the words; other workers see the version change instead
+        """
+        with self._lock:
+            self.overlays.pop((user_id, lang_code), None)
+
+    @staticmethod
+    def contains(words, word):
+        return isinstance(word, str) and word.strip().lower() in words
+
+personal_word_overlay = PersonalWordOverlayService()
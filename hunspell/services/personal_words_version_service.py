@@ -0,0 +1,75 @@
+import time
+
+from django.conf import settings
+
+from ..shared_cache import get_shared_cache
+
+
+class PersonalWordsVersionService:
+    """
+    Version counters for users' word lists, per (user, language, word type) plus one per
+    (user, word type) covering all languages, kept in the cache shared by all workers
+    (PERSONAL_WORDS_SHARED_CACHE_ALIAS) and bumped on every write.
+
+    The cache must increment atomically (see get_shared_cache), or two workers bumping the
+    same counter at once could leave it bumped only once. Counters start from the current
+    time rather than 0, so a counter that was evicted from the cache never comes back with
+    a value handed out before. Without such a cache there are no counters: each worker reads
+    the words from the database, and ETags and the personal word overlay are turned off
+    rather than served stale by workers that missed a change.
+    """
+
+    ALL_LANGUAGES = '*'
+
+    def get(self, user_id, lang_code, word_type):
+        """
+        Args:
+            user_id: Id of the list's owner
+            lang_code: Language code, or None for the counter covering every language
+            word_type: 'dictionary' or 'starlist'
+
+        Returns:
+            int: Current version, or None if there is no cross-process cache to keep it in
+        """
+        cache = self._get_shared_cache()
+        if cache is None:
+            return None
+        key = self._version_key(user_id, lang_code, word_type)
+        try:
+            version = cache.get(key)
+            if version is None:
+                cache.add(key, time.time_ns(), timeout=None)
+                version = cache.get(key)
+            return version
+        except Exception as e:
+            print(f"Error reading personal words version: {str(e)}")
+            return None
+
+    def bump(self, user_id, lang_code, word_type):
+        """
+        Mark the user's list for ``lang_code`` (and the all-languages list) as changed
+        """
+        cache = self._get_shared_cache()
+        if cache is None:
+            return
+        for key in (
+            self._version_key(user_id, lang_code, word_type),
+            self._version_key(user_id, None, word_type),
+        ):
+            try:
+                cache.add(key, time.time_ns(), timeout=None)
+                cache.incr(key)
+            except ValueError:
+                # Evicted between add() and incr()
+                cache.set(key, time.time_ns(), timeout=None)
+            except Exception as e:
+                print(f"Error updating personal words version: {str(e)}")
+
+    @staticmethod
+    def _get_shared_cache():
+        return get_shared_cache(getattr(settings, 'PERSONAL_WORDS_SHARED_CACHE_ALIAS', None))
+
+    def _version_key(self, user_id, lang_code, word_type):
+        return f"personal-words-version:{user_id}:{word_type}:{lang_code or self.ALL_LANGUAGES}"
+
+personal_words_versions = PersonalWordsVersionService()
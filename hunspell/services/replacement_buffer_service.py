@@ -0,0 +1,170 @@
+import atexit
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, close_old_connections, transaction
+
+from ..models import WordReplacement
+
+
+class ReplacementBufferService:
+    """
+    Write-behind buffer for WordReplacement rows, enabled with REPLACEMENT_BUFFER_ENABLED.
+
+    Rows are collected in memory and written with one bulk_create when
+    REPLACEMENT_BUFFER_FLUSH_SIZE rows are waiting or REPLACEMENT_BUFFER_FLUSH_INTERVAL
+    seconds have passed, by a background thread in each worker, and once more when the
+    worker exits.
+
+    Loss semantics: rows accepted but not yet flushed are lost if the worker is killed
+    without a clean shutdown. Rows from failed flushes are retried. At most
+    REPLACEMENT_BUFFER_MAX_PENDING rows are held; past that, REPLACEMENT_BUFFER_OVERFLOW
+    decides between writing the row synchronously ('sync', nothing lost) and dropping
+    it ('drop', the request never waits on the database).
+    """
+
+    def __init__(self):
+        self.rows = deque()
+        self.stats = {"buffered": 0, "flushed": 0, "dropped": 0, "sync_writes": 0, "failed_flushes": 0}
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+        # Set when rows were put back because the database was unavailable
+        self._retrying = False
+
+    def enabled(self):
+        return getattr(settings, 'REPLACEMENT_BUFFER_ENABLED', False)
+
+    def add(self, **fields):
+        """
+        Queue one WordReplacement for writing
+
+        Args:
+            **fields: WordReplacement field values
+
+        Returns:
+            bool: True if the row was buffered or written, False if it was dropped
+        """
+        max_pending = getattr(settings, 'REPLACEMENT_BUFFER_MAX_PENDING', 10000)
+        with self._condition:
+            self._ensure_thread()
+            if len(self.rows) < max_pending:
+                self.rows.append(WordReplacement(**fields))
+                self.stats["buffered"] += 1
+                if len(self.rows) >= getattr(settings, 'REPLACEMENT_BUFFER_FLUSH_SIZE', 500):
+                    self._condition.notify()
+                return True
+
+            if getattr(settings, 'REPLACEMENT_BUFFER_OVERFLOW', 'sync') != 'sync':
+                self.stats["dropped"] += 1
+                return False
+            self.stats["sync_writes"] += 1
+
+        WordReplacement.objects.create(**fields)
+        return True
+
+    def flush(self):
+        """
+        Write every buffered row now
+
+        Returns:
+            int: Number of rows written
+        """
+        with self._flush_lock:
+            with self._condition:
+                batch = list(self.rows)
+                self.rows.clear()
+            if not batch:
+                return 0
+
+            self._retrying = False
+            try:
+                # Atomic, so a failure leaves nothing half-written for the row-by-row retry to duplicate
+                with transaction.atomic():
+                    WordReplacement.objects.bulk_create(batch, batch_size=1000)
+                written = len(batch)
+            except Exception as e:
+                print(f"Error flushing {len(batch)} word replacements: {str(e)}")
+                self.stats["failed_flushes"] += 1
+                written = self._write_one_by_one(batch)
+
+            self.stats["flushed"] += written
+            return written
+
+    def _write_one_by_one(self, batch):
+        # Separates rows the database rejects (e.g. for a deleted user) from a database
+        # that is unavailable, in which case the rest goes back to the buffer for the next flush
+        written = 0
+        for index, row in enumerate(batch):
+            try:
+                row.save(force_insert=True)
+                written += 1
+            except (IntegrityError, DataError) as e:
+                print(f"Dropping word replacement {row}: {str(e)}")
+                self.stats["dropped"] += 1
+            except Exception:
+                self._requeue(batch[index:])
+                self._retrying = True
+                break
+        return written
+
+    def _requeue(self, batch):
+        max_pending = getattr(settings, 'REPLACEMENT_BUFFER_MAX_PENDING', 10000)
+        with self._condition:
+            self.rows.extendleft(reversed(batch))
+            while len(self.rows) > max_pending:
+                self.rows.pop()
+                self.stats["dropped"] += 1
+
+    def _ensure_thread(self):
+        # Called with the condition held. Threads don't survive fork, so each worker starts its own
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        self._pid = os.getpid()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='replacement-buffer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        interval = getattr(settings, 'REPLACEMENT_BUFFER_FLUSH_INTERVAL', 5)
+        flush_size = getattr(settings, 'REPLACEMENT_BUFFER_FLUSH_SIZE', 500)
+        while True:
+            deadline = time.monotonic() + interval
+            with self._condition:
+                # After a failed flush, wait out the interval even if the buffer is full
+                while not self._stopping and (self._retrying or len(self.rows) < flush_size):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._stopping:
+                    return
+
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error in replacement buffer: {str(e)}")
+
+    def shutdown(self):
+        """
+        Stop the background thread and write whatever is still buffered
+
+        Returns:
+            int: Number of rows written
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=10)
+        return self.flush()
+
+replacement_buffer = ReplacementBufferService()
+# Workers exit through sys.exit on a graceful shutdown, which runs atexit handlers
+atexit.register(replacement_buffer.shutdown)
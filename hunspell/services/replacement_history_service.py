@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, F
+
+from ..models import WordReplacement
+
+
+class ReplacementHistoryService:
+    """
+    What users actually replaced each misspelling with, kept per worker as
+    (language, original word) -> replacements ranked by how many users chose them.
+
+    Only replacements made by at least REPLACEMENT_HISTORY_MIN_COUNT distinct signed-in
+    users are kept, so anonymous or repeated submissions can't push a word into everyone's
+    suggestions. The aggregate is loaded once (in the gunicorn master, so workers start
+    with it) and then maintained from the rows added since: every
+    REPLACEMENT_HISTORY_REFRESH_SECONDS a background thread recounts only the words those
+    rows touched. Requests never wait for it and are answered from the previous result.
+    """
+
+    # Touched words recounted per query
+    RECOUNT_BATCH_SIZE = 500
+
+    def __init__(self, refresh_interval=None, min_count=None, max_suggestions=None):
+        if refresh_interval is None:
+            refresh_interval = getattr(settings, 'REPLACEMENT_HISTORY_REFRESH_SECONDS', 60)
+        if min_count is None:
+            min_count = getattr(settings, 'REPLACEMENT_HISTORY_MIN_COUNT', 3)
+        if max_suggestions is None:
+            max_suggestions = getattr(settings, 'REPLACEMENT_HISTORY_MAX_SUGGESTIONS', 5)
+        self.refresh_interval = refresh_interval
+        self.min_count = min_count
+        self.max_suggestions = max_suggestions
+
+        # (language, original word) -> replacements ranked by distinct users, replaced as a whole on refresh
+        self.ranked = {}
+        # Highest WordReplacement id folded into ranked (0 before the first load)
+        self.last_id = 0
+        self.last_refresh = None
+        self._refresh_lock = threading.Lock()
+
+    def enabled(self):
+        return getattr(settings, 'REPLACEMENT_HISTORY_ENABLED', True)
+
+    def get_replacements(self, word, lang_code):
+        """
+        Args:
+            word: The misspelled word, as sent by the client
+            lang_code: Language code (e.g., 'en_US', 'de_DE')
+
+        Returns:
+            list: Replacements users chose for the word, most chosen first, or None without enough history
+        """
+        if not self.enabled() or not isinstance(word, str):
+            return None
+        self._maybe_refresh()
+        return self.ranked.get((lang_code, word))
+
+    def _maybe_refresh(self):
+        if self.last_refresh is not None and time.monotonic() - self.last_refresh < self.refresh_interval:
+            return
+        # Held until the background refresh finishes, so only one runs at a time
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            threading.Thread(target=self._refresh_in_background, name='replacement-history', daemon=True).start()
+        except Exception:
+            self._refresh_lock.release()
+            raise
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        finally:
+            # The thread's own database connection would otherwise stay open until the process exits
+            connections.close_all()
+            self._refresh_lock.release()
+
+    def refresh(self):
+        """
+        Recount the words that got replacements from signed-in users since the last refresh,
+        or every word on the first one
+        """
+        start = time.perf_counter()
+        try:
+            last_id = WordReplacement.objects.order_by('-id').values_list('id', flat=True).first() or 0
+            if last_id == self.last_id and self.last_id:
+                return
+            if self.last_id == 0:
+                ranked = self._rank(WordReplacement.objects.filter(id__lte=last_id))
+            else:
+                touched = defaultdict(set)
+                for lang_code, original_word in (
+                    WordReplacement.objects
+                    .filter(id__gt=self.last_id, id__lte=last_id, user__isnull=False)
+                    .values_list('lang_code', 'original_word')
+                    .order_by()
+                    .distinct()
+                    .iterator(chunk_size=5000)
+                ):
+                    touched[lang_code].add(original_word)
+
+                ranked = dict(self.ranked)
+                for lang_code, original_words in touched.items():
+                    original_words = list(original_words)
+                    for i in range(0, len(original_words), self.RECOUNT_BATCH_SIZE):
+                        batch = original_words[i:i + self.RECOUNT_BATCH_SIZE]
+                        for original_word in batch:
+                            ranked.pop((lang_code, original_word), None)
+                        ranked.update(self._rank(
+                            WordReplacement.objects.filter(lang_code=lang_code, original_word__in=batch)
+                        ))
+        except Exception as e:
+            print(f"Error refreshing replacement history: {str(e)}")
+            return
+        finally:
+            # Also set on errors, so a database outage isn't retried on every request
+            self.last_refresh = time.monotonic()
+
+        updated = len(ranked) if self.last_id == 0 else sum(len(words) for words in touched.values())
+        self.ranked = ranked
+        self.last_id = last_id
+        if updated:
+            print(f"Replacement history: {updated} words updated in {time.perf_counter() - start:.2f}s")
+
+    def _rank(self, queryset):
+        """
+        Returns:
+            dict: (language, original word) -> replacements chosen by at least min_count
+                  distinct signed-in users, most chosen first, for the words in the queryset
+        """
+        rows = (
+            queryset
+            .filter(user__isnull=False)
+            .exclude(replacement_word=F('original_word'))
+            .values('lang_code', 'original_word', 'replacement_word')
+            .annotate(users=Count('user', distinct=True))
+            .filter(users__gte=self.min_count)
+            .order_by('lang_code', 'original_word', '-users', 'replacement_word')
+            .values_list('lang_code', 'original_word', 'replacement_word')
+        )
+        ranked = {}
+        for lang_code, original_word, replacement_word in rows.iterator(chunk_size=5000):
+            replacements = ranked.setdefault((lang_code, original_word), [])
+            if len(replacements) < self.max_suggestions:
+                replacements.append(replacement_word)
+        return ranked
+
+replacement_history = ReplacementHistoryService()
@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..models import RollupWatermark, WordReplacement, WordReplacementDailyRollup
+
+ROLLUP_NAME = 'word_replacement_daily'
+
+
+class ReplacementRollupService:
+    @staticmethod
+    def roll_up(batch_size: int = 100000, lag_seconds: int = 60) -> dict:
+        """
+        Fold WordReplacement rows newer than the watermark into the daily rollup
+
+        Each batch is aggregated with one GROUP BY over its id range and applied together
+        with the watermark in one transaction, so rows are counted exactly once even if a
+        run is interrupted or two runs overlap.
+
+        Args:
+            batch_size: Source rows (by id) aggregated per transaction
+            lag_seconds: Rows younger than this are left for the next run, so rows from
+                         transactions still in flight (with lower ids) are not skipped
+
+        Returns:
+            dict: "rows" folded in, rollup "keys" touched, "batches" and the new "last_id"
+        """
+        cutoff = timezone.now() - timedelta(seconds=lag_seconds)
+        upper_id = WordReplacement.objects.filter(created_at__lte=cutoff).aggregate(Max('id'))['id__max'] or 0
+
+        stats = {"rows": 0, "keys": 0, "batches": 0, "last_id": 0}
+        while True:
+            with transaction.atomic():
+                watermark, _ = RollupWatermark.objects.get_or_create(name=ROLLUP_NAME)
+                # Serializes concurrent runs
+                watermark = RollupWatermark.objects.select_for_update().get(pk=watermark.pk)
+                stats["last_id"] = watermark.last_id
+                if watermark.last_id >= upper_id:
+                    break
+
+                batch_end = min(watermark.last_id + batch_size, upper_id)
+                groups = (
+                    WordReplacement.objects
+                    .filter(id__gt=watermark.last_id, id__lte=batch_end)
+                    .annotate(day=TruncDate('created_at'))
+                    .values('lang_code', 'original_word', 'replacement_word', 'day')
+                    .annotate(rows=Count('id'))
+                    .order_by()
+                )
+                stats["keys"] += ReplacementRollupService._apply(groups, stats)
+
+                watermark.last_id = batch_end
+                watermark.save(update_fields=['last_id', 'updated_at'])
+                stats["last_id"] = batch_end
+                stats["batches"] += 1
+        return stats
+
+    @staticmethod
+    def _apply(groups, stats) -> int:
+        increments = {}
+        for group in groups:
+            key = (group['lang_code'], group['original_word'], group['replacement_word'], group['day'])
+            increments[key] = group['rows']
+            stats["rows"] += group['rows']
+        if not increments:
+            return 0
+
+        existing = {}
+        days = {key[3] for key in increments}
+        languages = {key[0] for key in increments}
+        originals = {key[1] for key in increments}
+        for rollup in WordReplacementDailyRollup.objects.select_for_update().filter(
+            lang_code__in=languages, day__in=days, original_word__in=originals
+        ):
+            key = (rollup.lang_code, rollup.original_word, rollup.replacement_word, rollup.day)
+            if key in increments:
+                existing[key] = rollup
+
+        for key, rollup in existing.items():
+            rollup.count += increments[key]
+        WordReplacementDailyRollup.objects.bulk_update(existing.values(), ['count'], batch_size=1000)
+        WordReplacementDailyRollup.objects.bulk_create(
+            [
+                WordReplacementDailyRollup(
+                    lang_code=lang_code,
+                    original_word=original_word,
+                    replacement_word=replacement_word,
+                    day=day,
+                    count=count
+                )
+                for (lang_code, original_word, replacement_word, day), count in increments.items()
+                if (lang_code, original_word, replacement_word, day) not in existing
+            ],
+            batch_size=1000
+        )
+        return len(increments)
+
+    @staticmethod
+    def top_replacements(lang_code: str = None, start=None, end=None, group_by: str = 'pair', limit: int = 50) -> list:
+        """
+        Most frequent typos (or typo -> replacement pairs) from the rollup
+
+        Args:
+            lang_code: Only this language, or None for all
+            start: First day included, or None
+            end: Last day included, or None
+            group_by: 'pair' for (original, replacement) pairs, 'word' for original words,
+                      'day' for daily totals
+            limit: Number of rows returned
+
+        Returns:
+            list: Dicts with the grouped fields and their "count", most frequent first
+                  (by date for 'day')
+        """
+        queryset = WordReplacementDailyRollup.objects.all()
+        if lang_code:
+            queryset = queryset.filter(lang_code=lang_code)
+        if start:
+            queryset = queryset.filter(day__gte=start)
+        if end:
+            queryset = queryset.filter(day__lte=end)
+
+        fields = {
+            'pair': ['original_word', 'replacement_word'],
+            'word': ['original_word'],
+            'day': ['day'],
+        }[group_by]
+        ordering = ['-day'] if group_by == 'day' else ['-count', *fields]
+        return list(
+            queryset.values(*fields).annotate(count=Sum('count')).order_by(*ordering)[:limit]
+        )
+
+    @staticmethod
+    def get_watermark():
+        """
+        Returns:
+            RollupWatermark: How far the rollup has got, or None before the first run
+        """
+        return RollupWatermark.objects.filter(name=ROLLUP_NAME).first()
@@ -0,0 +1,165 @@
+import json
+import os
+import pstats
+import re
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{8}T[0-9]{12}-[0-9a-f]{8}$')
+
+
+class RequestProfileService:
+    """
+    cProfile dumps of individual requests, kept in PROFILE_DIR as ``<id>.prof`` (loadable
+    with pstats, snakeviz...) next to an ``<id>.json`` with the view, language and timing.
+    Only the newest PROFILE_MAX_COUNT profiles are kept. The directory can be shared by
+    every worker on a host.
+    """
+
+    @staticmethod
+    def get_dir():
+        default_dir = Path(settings.BASE_DIR) / 'profiles'
+        return Path(getattr(settings, 'PROFILE_DIR', default_dir))
+
+    def save(self, profiler, view_name, lang_code, duration, path, words=None):
+        """
+        Store a finished profile
+
+        Args:
+            profiler: A cProfile.Profile that is no longer enabled
+            view_name: Name of the profiled view
+            lang_code: Language of the request
+            duration: Wall time of the profiled work in seconds
+            path: Request path
+            words: Number of words in the request, if known
+
+        Returns:
+            str: Id of the stored profile
+        """
+        profile_dir = self.get_dir()
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+        # UTC time down to the microsecond first, so ids sort oldest to newest
+        now = time.time()
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))}{int(now % 1 * 1000000):06d}-{uuid.uuid4().hex[:8]}"
+        profiler.dump_stats(str(profile_dir / f"{profile_id}.prof"))
+        metadata = {
+            "id": profile_id,
+            "view": view_name,
+            "language": lang_code,
+            "path": path,
+            "words": words,
+            "duration": round(duration, 6),
+            "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now)),
+        }
+        # Written last, so a listed profile always has its .prof file
+        with open(profile_dir / f"{profile_id}.json", 'w') as f:
+            json.dump(metadata, f)
+
+        self._prune(profile_dir)
+        return profile_id
+
+    def _prune(self, profile_dir):
+        max_count = getattr(settings, 'PROFILE_MAX_COUNT', 200)
+        for metadata_path in sorted(profile_dir.glob('*.json'))[:-max_count or None]:
+            for path in (metadata_path, metadata_path.with_suffix('.prof')):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def list_profiles(self, lang_code=None, view_name=None):
+        """
+        Returns:
+            list: Metadata of the stored profiles, newest first, optionally only for one language or view
+        """
+        profiles = []
+        for metadata_path in sorted(self.get_dir().glob('*.json'), reverse=True):
+            try:
+                with open(metadata_path, 'r') as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError):
+                # Pruned by another worker, or still being written
+                continue
+            if lang_code and metadata.get('language') != lang_code:
+                continue
+            if view_name and metadata.get('view') != view_name:
+                continue
+            profiles.append(metadata)
+        return profiles
+
+    def get_path(self, profile_id):
+        """
+        Returns:
+            Path: The profile's .prof file, or None if there is no such profile
+        """
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self.get_dir() / f"{profile_id}.prof"
+        return path if path.exists() else None
+
+    def top_functions(self, lang_code=None, view_name=None, sort='tottime', limit=30):
+        """
+        Merge the stored profiles and rank functions by where the time went
+
+        Args:
+            lang_code: Only profiles of this language, or None for all
+            view_name: Only profiles of this view, or None for all
+            sort: 'tottime' (time in the function itself) or 'cumtime' (including callees)
+            limit: Number of functions returned
+
+        Returns:
+            dict: Number of "profiles" merged, their total "duration" and the top "functions"
+        """
+        profiles = self.list_profiles(lang_code, view_name)
+        stats = None
+        merged = 0
+        duration = 0.0
+        for metadata in profiles:
+            path = self.get_path(metadata['id'])
+            if path is None:
+                continue
+            try:
+                if stats is None:
+                    stats = pstats.Stats(str(path))
+                else:
+                    stats.add(str(path))
+            except (OSError, EOFError, TypeError, ValueError) as e:
+                print(f"Error reading profile {metadata['id']}: {str(e)}")
+                continue
+            merged += 1
+            duration += metadata.get('duration') or 0
+
+        functions = []
+        if stats is not None:
+            index = 2 if sort == 'tottime' else 3
+            ranked = sorted(stats.stats.items(), key=lambda item: item[1][index], reverse=True)
+            for (filename, line, name), (primitive_calls, calls, tottime, cumtime, _) in ranked[:limit]:
+                functions.append({
+                    "function": name,
+                    "location": f"{self._short_path(filename)}:{line}",
+                    "calls": calls,
+                    "primitive_calls": primitive_calls,
+                    "tottime": round(tottime, 6),
+                    "cumtime": round(cumtime, 6),
+                    "percall": round(tottime / calls, 9) if calls else 0,
+                })
+
+        return {
+            "profiles": merged,
+            "duration": round(duration, 6),
+            "functions": functions,
+        }
+
+    @staticmethod
+    def _short_path(filename):
+        # "/usr/lib/python3.11/site-packages/spylls/hunspell/algo/suggest.py" -> "spylls/hunspell/algo/suggest.py"
+        for marker in ('site-packages' + os.sep, 'dist-packages' + os.sep, str(settings.BASE_DIR) + os.sep):
+            if marker in filename:
+                return filename.split(marker, 1)[1]
+        return filename
+
+request_profiles = RequestProfileService()
@@ -1,20 +1,246 @@
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+
 from ..check_spell import SpellChecker
+from ..metrics import DICTIONARIES_LOADED, DICTIONARY_ESTIMATED_BYTES, DICTIONARY_LOAD_SECONDS, SUGGESTION_CACHE
+from .replacement_history_service import replacement_history
+from .suggestion_pool_service import BrokenProcessPool, suggestion_pool
 
-class SpellCheckerService:
+def _new_load_stats():
+    return {
+        "loads": 0,
+        "last_duration": 0.0,
+        "total_duration": 0.0,
+        "waits": 0,
+        "wait_time": 0.0,
+        "timeouts": 0,
+    }
+
+class _PendingLoad:
     def __init__(self):
-        self.spell_checkers = {}
-    
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SpellCheckerService:
+    def __init__(self, memory_budget=None, pinned_languages=None, eviction_policy=None):
+        # Ordered from least to most recently used
+        self.spell_checkers = OrderedDict()
+        self.access_counts = Counter()
+        self.load_stats = defaultdict(_new_load_stats)
+        self._lock = threading.RLock()
+        # Language code -> _PendingLoad for dictionaries being loaded right now
+        self._loading = {}
+        # Requested language code -> language actually loaded, when loading fell back to English
+        self._fallbacks = {}
+
+        if memory_budget is None:
+            # The budget covers a worker together with its suggestion pool processes, which
+            # each load their own dictionaries: every one of them gets an equal share
+            processes = 1 + max(getattr(settings, 'SUGGESTION_POOL_WORKERS', 0), 0)
+            memory_budget = getattr(settings, 'SPELLCHECK_MEMORY_BUDGET_MB', 0) * 1024 * 1024 // processes
+        if pinned_languages is None:
+            pinned_languages = [
+                *getattr(settings, 'SPELLCHECK_PINNED_LANGUAGES', ['en_US']),
+                *getattr(settings, 'SPELLCHECK_HOT_LANGUAGES', []),
+            ]
+        if eviction_policy is None:
+            eviction_policy = getattr(settings, 'SPELLCHECK_EVICTION_POLICY', 'lru')
+
+        self.memory_budget = memory_budget  # bytes, 0 means unlimited
+        self.pinned_languages = set(pinned_languages)
+        self.eviction_policy = eviction_policy
+
     def get_spell_checker(self, lang_code='en_US'):
         try:
-            # Create new spell checker instance if language not cached or if existing instance has different language
-            if lang_code not in self.spell_checkers or self.spell_checkers[lang_code].lang_code != lang_code:
-                self.spell_checkers[lang_code] = SpellChecker(lang_code=lang_code)
-            return self.spell_checkers[lang_code]
+            # Unsupported codes would fall back to English inside SpellChecker anyway; resolve them
+            # here so they share the English instance instead of each loading their own copy
+            if lang_code not in SpellChecker.SUPPORTED_LANGUAGES:
+                lang_code = 'en_US'
+
+            with self._lock:
+                lang_code = self._fallbacks.get(lang_code, lang_code)
+                spell_checker = self.spell_checkers.get(lang_code)
+                if spell_checker is not None:
+                    self.spell_checkers.move_to_end(lang_code)
+                    self.access_counts[lang_code] += 1
+                    return spell_checker
+
+                # Single flight: only the first thread loads a language, the others wait for it
+                pending = self._loading.get(lang_code)
+                is_loader = pending is None
+                if is_loader:
+                    pending = _PendingLoad()
+                    self._loading[lang_code] = pending
+
+            if is_loader:
+                return self._load(lang_code, pending)
+            return self._wait_for_load(lang_code, pending)
         except Exception as e:
             print(f"Error getting spell checker: {str(e)}")
             # Fallback to English if there's an error
+            if lang_code != 'en_US':
+                return self.get_spell_checker('en_US')
             return SpellChecker(lang_code='en_US')
 
+    def _load(self, lang_code, pending):
+        start = time.perf_counter()
+        try:
+            spell_checker = SpellChecker(lang_code=lang_code)
+        except Exception as e:
+            with self._lock:
+                del self._loading[lang_code]
+            pending.error = e
+            pending.event.set()
+            raise
+        duration = time.perf_counter() - start
+        DICTIONARY_LOAD_SECONDS.labels(lang_code).observe(duration)
+
+        with self._lock:
+            stats = self.load_stats[lang_code]
+            stats["loads"] += 1
+            stats["last_duration"] = duration
+            stats["total_duration"] += duration
+
+            # SpellChecker falls back to English when a dictionary fails to load
+            if spell_checker.lang_code != lang_code:
+                self._fallbacks[lang_code] = spell_checker.lang_code
+            loaded_code = spell_checker.lang_code
+            spell_checker = self.spell_checkers.setdefault(loaded_code, spell_checker)
+            self._report_loaded(loaded_code, spell_checker)
+            self.spell_checkers.move_to_end(loaded_code)
+            self.access_counts[loaded_code] += 1
+            self._evict(keep=loaded_code)
+            del self._loading[lang_code]
+
+        pending.result = spell_checker
+        pending.event.set()
+        return spell_checker
+
+    def _wait_for_load(self, lang_code, pending):
+        timeout = getattr(settings, 'SPELLCHECK_LOAD_WAIT_TIMEOUT', 60)
+        start = time.perf_counter()
+        finished = pending.event.wait(timeout)
+        waited = time.perf_counter() - start
+
+        with self._lock:
+            stats = self.load_stats[lang_code]
+            stats["waits"] += 1
+            stats["wait_time"] += waited
+            if not finished:
+                stats["timeouts"] += 1
+
+        if not finished:
+            raise TimeoutError(f"Timed out after {timeout}s waiting for '{lang_code}' to load")
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def get_load_stats(self):
+        """
+        Load durations and single-flight contention per language
+
+        Returns:
+            dict: For each language code, the number of loads and their durations in seconds,
+                  plus how many requests waited on another thread's load, for how long,
+                  and how many of those waits timed out
+        """
+        with self._lock:
+            return {code: dict(stats) for code, stats in self.load_stats.items()}
+
+    def preload(self, languages):
+        """
+        Load spell checkers ahead of the first request, e.g. in the gunicorn master before fork
+
+        Args:
+            languages: Language codes to load
+
+        Returns:
+            dict: Load duration in seconds per language code
+        """
+        durations = {}
+        for lang_code in languages:
+            start = time.perf_counter()
+            self.get_spell_checker(lang_code)
+            durations[lang_code] = time.perf_counter() - start
+        return durations
+
+    def report_loaded_metrics(self):
+        """
+        Set this process's loaded-dictionary gauges from the spell checkers it holds, e.g. in
+        a freshly forked worker, whose gauges start at zero even for dictionaries inherited
+        from the gunicorn master
+        """
+        with self._lock:
+            for lang_code, spell_checker in self.spell_checkers.items():
+                self._report_loaded(lang_code, spell_checker)
+
+    @staticmethod
+    def _report_loaded(lang_code, spell_checker):
+        # Set rather than incremented, so the gauges always match spell_checkers
+        DICTIONARIES_LOADED.labels(lang_code).set(0 if spell_checker is None else 1)
+        DICTIONARY_ESTIMATED_BYTES.labels(lang_code).set(0 if spell_checker is None else spell_checker.estimated_size)
+
+    def _evict(self, keep):
+        """
+        Unload cold, unpinned spell checkers until the estimated total size fits the memory budget.
+        Must be called with the lock held.
+        """
+        if not self.memory_budget:
+            return
+
+        while self.total_estimated_size() > self.memory_budget:
+            candidates = [
+                code for code in self.spell_checkers
+                if code != keep and code not in self.pinned_languages
+            ]
+            if not candidates:
+                break
+
+            if self.eviction_policy == 'lfu':
+                # Least frequently used; min() keeps the least recently used one on ties
+                victim = min(candidates, key=lambda code: self.access_counts[code])
+            else:
+                victim = candidates[0]
+
+            evicted = self.spell_checkers.pop(victim)
+            self.access_counts.pop(victim, None)
+            self._report_loaded(victim, None)
+            print(f"Evicted spell checker '{victim}' (~{evicted.estimated_size // (1024 * 1024)} MB)")
+
+    def total_estimated_size(self):
+        return sum(checker.estimated_size for checker in self.spell_checkers.values())
+
+    def get_memory_report(self):
+        """
+        Estimated size and usage of every loaded spell checker
+
+        Returns:
+            dict: Budget and totals in bytes, plus one entry per loaded language
+                  from least to most recently used
+        """
+        with self._lock:
+            languages = [
+                {
+                    "lang_code": code,
+                    "estimated_size": checker.estimated_size,
+                    "accesses": self.access_counts[code],
+                    "pinned": code in self.pinned_languages,
+                }
+                for code, checker in self.spell_checkers.items()
+            ]
+            return {
+                "memory_budget": self.memory_budget,
+                "total_estimated_size": self.total_estimated_size(),
+                "eviction_policy": self.eviction_policy,
+                "languages": languages,
+            }
+
     def check_spelling(self, word, lang_code='en_US'):
         spell_checker = self.get_spell_checker(lang_code)
         return spell_checker.check_text(word)
@@ -22,15 +248,145 @@ class SpellCheckerService:
     def get_suggestions(self, word, lang_code='en_US'):
         try:
             spell_checker = self.get_spell_checker(lang_code)
+            suggestions = self._get_cached_suggestions(spell_checker, word)
+            if suggestions is not None:
+                return suggestions
+
             suggestions = spell_checker.get_suggestions(word)
             print(f"Original suggestions for '{word}': {suggestions}")  # Debug log
-        
-            
+            self._cache_suggestions(spell_checker, word, suggestions)
+
             # If no suggestions remain after filtering, return empty list
             return suggestions if suggestions else []
         except Exception as e:
             print(f"Error getting suggestions for word '{word}': {str(e)}")
             return []
 
+    def get_suggestions_many(self, words, lang_code='en_US', deadline=None, use_history=True):
+        """
+        Get suggestions for several words, stopping at a deadline
+
+        Args:
+            words: Words to get suggestions for
+            lang_code: Language code (e.g., 'en_US', 'de_DE')
+            deadline: Seconds to spend at most; defaults to SUGGESTION_REQUEST_DEADLINE (0 = no deadline)
+            use_history: Answer words with enough replacement history from it, see ``iter_suggestions``
+
+        Returns:
+            tuple: (dict of word -> suggestions, list of words not finished before the deadline)
+        """
+        suggestions = {}
+        pending = []
+        for word, word_suggestions in self.iter_suggestions(words, lang_code, deadline, use_history):
+            if word_suggestions is None:
+                pending.append(word)
+            else:
+                suggestions[word] = word_suggestions
+        return suggestions, pending
+
+    def iter_suggestions(self, words, lang_code='en_US', deadline=None, use_history=True):
+        """
+        Yield suggestions for several words as soon as each one is available, cheapest first
+
+        Words users have often replaced before are answered with those replacements, then
+        cached words follow. Cache misses are fanned out to the suggestion process pool
+        when SUGGESTION_POOL_WORKERS is set and yielded in completion order; otherwise they
+        are computed in this thread, shortest words first.
+
+        Args:
+            words: Words to get suggestions for (duplicates are only yielded once)
+            lang_code: Language code (e.g., 'en_US', 'de_DE')
+            deadline: Seconds to spend at most; defaults to SUGGESTION_REQUEST_DEADLINE (0 = no deadline)
+            use_history: False skips the replacement history, e.g. when the client wants
+                         the full dictionary suggestions
+
+        Yields:
+            tuple: (word, suggestions), or (word, None) for words not finished before the deadline
+        """
+        if deadline is None:
+            deadline = getattr(settings, 'SUGGESTION_REQUEST_DEADLINE', 0)
+        expires_at = time.monotonic() + deadline if deadline else None
+
+        spell_checker = self.get_spell_checker(lang_code)
+        misses = []
+        for word in dict.fromkeys(words):
+            if use_history:
+                # Keyed by the language actually loaded, which differs from lang_code after a fallback
+                replacements = replacement_history.get_replacements(word, spell_checker.lang_code)
+                if replacements:
+                    # Only replacements the dictionary accepts, so bad submissions aren't echoed back
+                    replacements = [r for r in replacements if spell_checker.check_text(r)]
+                if replacements:
+                    # The fast path: no suggest() for words users have already corrected
+                    yield word, replacements
+                    continue
+
+            cached = self._get_cached_suggestions(spell_checker, word)
+            if cached is not None:
+                yield word, cached
+            else:
+                misses.append(word)
+
+        # suggest() cost grows with word length, so short words are the quickest to deliver
+        misses.sort(key=lambda word: len(word) if isinstance(word, str) else 0)
+
+        if misses and suggestion_pool.enabled():
+            done = set()
+            try:
+                for word, word_suggestions in suggestion_pool.iter_suggest(
+                    misses, spell_checker.lang_code, expires_at
+                ):
+                    done.add(word)
+                    if word_suggestions is not None:
+                        self._cache_suggestions(spell_checker, word, word_suggestions)
+                    yield word, word_suggestions
+                return
+            except BrokenProcessPool as e:
+                print(f"Suggestion pool failed, computing in process: {str(e)}")
+                misses = [word for word in misses if word not in done]
+
+        for word in misses:
+            if expires_at is not None and time.monotonic() >= expires_at:
+                yield word, None
+                continue
+            word_suggestions = spell_checker.get_suggestions(word)
+            self._cache_suggestions(spell_checker, word, word_suggestions)
+            yield word, word_suggestions
+
+    def _get_cached_suggestions(self, spell_checker, word):
+        cache = self._get_suggestion_cache()
+        if cache is None:
+            return None
+        try:
+            suggestions = cache.get(self._suggestion_cache_key(spell_checker, word))
+        except Exception as e:
+            print(f"Error reading suggestion cache: {str(e)}")
+            SUGGESTION_CACHE.labels(spell_checker.lang_code, 'error').inc()
+            return None
+        SUGGESTION_CACHE.labels(spell_checker.lang_code, 'miss' if suggestions is None else 'hit').inc()
+        return suggestions
+
+    def _cache_suggestions(self, spell_checker, word, suggestions):
+        cache = self._get_suggestion_cache()
+        if cache is None:
+            return
+        try:
+            cache.set(self._suggestion_cache_key(spell_checker, word), suggestions)
+        except Exception as e:
+            print(f"Error writing suggestion cache: {str(e)}")
+
+    @staticmethod
+    def _get_suggestion_cache():
+        alias = getattr(settings, 'SUGGESTION_CACHE_ALIAS', None)
+        if not alias or alias not in settings.CACHES:
+            return None
+        return caches[alias]
+
+    @staticmethod
+    def _suggestion_cache_key(spell_checker, word):
+        # Words can contain spaces and arbitrary unicode, which are not valid in every backend's keys
+        word_digest = hashlib.sha1(word.encode('utf-8', 'surrogatepass')).hexdigest()
+        return f"suggest:{spell_checker.lang_code}:{spell_checker.dict_version[:16]}:{word_digest}"
+
 spell_checker_service = SpellCheckerService()
 
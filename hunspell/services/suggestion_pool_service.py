@@ -0,0 +1,133 @@
+import multiprocessing
+import multiprocessing.util
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+
+def _init_pool_process(languages):
+    # Pool processes start from a fresh interpreter (see _get_mp_context), so Django and
+    # the hot dictionaries are set up here before the first word arrives
+    import django
+    django.setup()
+
+    # Pool processes aren't gunicorn workers, so nothing else drops their live gauges
+    # (dictionaries they loaded) once they exit
+    from ..metrics import mark_process_dead
+    multiprocessing.util.Finalize(None, mark_process_dead, args=(os.getpid(),), exitpriority=0)
+
+    from .spell_check_service import spell_checker_service
+    spell_checker_service.preload(languages)
+
+
+def _compute_suggestions(word, lang_code):
+    # Runs inside a pool process, which keeps its own spell checkers (other languages
+    # than the preloaded ones are loaded on first use)
+    from .spell_check_service import spell_checker_service
+    spell_checker = spell_checker_service.get_spell_checker(lang_code)
+    return spell_checker.get_suggestions(word)
+
+
+class SuggestionPoolService:
+    """
+    Process pool that computes spylls suggestions on several cores at once,
+    since suggest() is pure Python and holds the GIL for the whole call
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def enabled():
+        return getattr(settings, 'SUGGESTION_POOL_WORKERS', 0) > 0
+
+    @staticmethod
+    def _get_mp_context():
+        # Not fork: the pool is created (and recreated after a crash) inside a threaded
+        # worker, and a forked child could inherit a lock another thread was holding.
+        # A forkserver child is forked from a clean single-threaded server process.
+        start_method = getattr(settings, 'SUGGESTION_POOL_START_METHOD', 'forkserver')
+        if start_method not in ('forkserver', 'spawn') or start_method not in multiprocessing.get_all_start_methods():
+            start_method = 'spawn'
+        return multiprocessing.get_context(start_method)
+
+    def _get_executor(self):
+        with self._lock:
+            # Pools don't survive fork, so each gunicorn worker creates its own on first use
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=settings.SUGGESTION_POOL_WORKERS,
+                    mp_context=self._get_mp_context(),
+                    initializer=_init_pool_process,
+                    initargs=(list(getattr(settings, 'SPELLCHECK_HOT_LANGUAGES', [])),),
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _reset(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def iter_suggest(self, words, lang_code, expires_at=None):
+        """
+        Compute suggestions for each word in the pool, yielding them as they finish
+
+        Args:
+            words: Unique words to get suggestions for
+            lang_code: Language code of an already resolved spell checker
+            expires_at: time.monotonic() value after which unfinished words are given up
+
+        Yields:
+            tuple: (word, suggestions) in completion order, then (word, None) for
+                   every word not finished in time
+
+        Raises:
+            BrokenProcessPool: If a pool process died; the pool is recreated on next use.
+                               Words already yielded are not computed again by the caller.
+        """
+        executor = self._get_executor()
+        try:
+            futures = {
+                executor.submit(_compute_suggestions, word, lang_code): word
+                for word in words
+            }
+        except BrokenProcessPool:
+            self._reset()
+            raise
+
+        timeout = None if expires_at is None else max(0, expires_at - time.monotonic())
+        finished = set()
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                finished.add(future)
+                word = futures[future]
+                try:
+                    yield word, future.result()
+                except BrokenProcessPool:
+                    self._reset()
+                    raise
+                except Exception as e:
+                    print(f"Error getting suggestions for word '{word}': {str(e)}")
+                    yield word, []
+        except FuturesTimeoutError:
+            pass
+        finally:
+            # Queued words are dropped (also when the caller stops iterating early);
+            # ones already running finish in the background
+            for future in futures:
+                if future not in finished:
+                    future.cancel()
+
+        for future, word in futures.items():
+            if future not in finished:
+                yield word, None
+
+suggestion_pool = SuggestionPoolService()
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.cache import caches
+
+# Backends that can hold locks and counters every worker relies on: add() and incr() are
+# atomic on the server, and entries are never dropped to make room for an unrelated write.
+# The file cache is neither (add() is has_key() then set(), and writes cull a random third
+# of the entries once it is full), and locmem is only visible to its own process.
+CROSS_PROCESS_BACKENDS = (
+    'django.core.cache.backends.redis.RedisCache',
+    'django_redis.cache.RedisCache',
+)
+
+_warned = set()
+
+
+def get_shared_cache(alias):
+    """
+    Args:
+        alias: Name of a cache in settings.CACHES, or None
+
+    Returns:
+        BaseCache: The cache, or None if it is not configured or not one of
+                   CROSS_PROCESS_BACKENDS; callers then keep their state per process
+    """
+    if not alias or alias not in settings.CACHES:
+        return None
+    if settings.CACHES[alias]['BACKEND'] not in CROSS_PROCESS_BACKENDS:
+        if alias not in _warned:
+            _warned.add(alias)
+            print(f"Warning: cache '{alias}' can't hold state shared by workers (needs Redis), keeping it per process")
+        return None
+    return caches[alias]
@@ -0,0 +1,126 @@
+import random
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from hunspell.services.document_session_service import DocumentSession, DocumentSessionService
+from hunspell.services.spell_check_service import spell_checker_service
+
+WORDS = [
+    'the', 'quick', 'brown', 'fox', 'jumps', 'over', 'lazy', 'dog', 'spelling', 'checker',
+    'wrold', 'teh', 'recieve', 'adress', "don't", 'e-mail', 'mispeled', 'zzxq', 'hello',
+]
+SESSION_CACHES = {
+    **settings.CACHES,
+    'sessions': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'sessions-test'},
+}
+SEPARATORS = [' ', ' ', ' ', '  ', '\n', ', ', '. ', '-', "'", '"']
+
+
+def random_text(rng, words):
+    return ''.join(rng.choice(WORDS) + rng.choice(SEPARATORS) for _ in range(words))
+
+
+def random_change(rng, length):
+    # Inserts, deletes and replacements, including ones that split, join or cut words in half
+    start = rng.randint(0, length)
+    end = min(length, start + rng.choice([0, 0, 1, 2, 5, 12]))
+    text = rng.choice(['', 'x', ' ', 'a', 'wrold ', ' teh', random_text(rng, rng.randint(1, 3)), '\n'])
+    return {"start": start, "end": end, "text": text}
+
+
+class DocumentSessionEditTests(TestCase):
+    """
+    Incremental results must always equal a full re-check of the edited text, both in the
+    session itself and as seen by a client that replaces its marks inside [start, end)
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Loading a dictionary writes its snapshot, which must not land in the repository
+        snapshot_dir = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.enterClassContext(override_settings(DICT_SNAPSHOT_DIR=snapshot_dir))
+        cls.spell_checker = spell_checker_service.get_spell_checker('en_US')
+
+    def full_check(self, text):
+        misspelled, _ = self.spell_checker.find_misspellings(text)
+        return misspelled
+
+    def apply_to_client(self, marks, length_change, start, end, misspelled):
+        old_end = end - length_change
+        return [
+            *(mark for mark in marks if mark[2] <= start),
+            *misspelled,
+            *((word, word_start + length_change, word_end + length_change)
+              for word, word_start, word_end in marks if word_start >= old_end),
+        ]
+
+    def run_edits(self, open_session, edit_session, seed, rounds=150):
+        rng = random.Random(seed)
+        text = random_text(rng, 40)
+        session = open_session(text)
+        client_marks = list(session.misspellings)
+        self.assertEqual(client_marks, self.full_check(text))
+
+        for revision in range(1, rounds + 1):
+            changes = []
+            for _ in range(rng.randint(1, 4)):
+                change = random_change(rng, len(text))
+                changes.append(change)
+                text = text[:change["start"]] + change["text"] + text[change["end"]:]
+
+            old_length = len(session.text)
+            session, (start, end, misspelled) = edit_session(session, revision, changes)
+            expected = self.full_check(text)
+
+            self.assertEqual(session.text, text)
+            self.assertEqual(session.misspellings, expected, f"seed {seed}, revision {revision}")
+            client_marks = self.apply_to_client(client_marks, len(text) - old_length, start, end, misspelled)
+            self.assertEqual(client_marks, expected, f"seed {seed}, revision {revision}")
+
+    def test_random_edits_match_full_recheck(self):
+        def open_session(text):
+            session = DocumentSession('en_US', text)
+            session.check_all()
+            return session
+
+        def edit_session(session, revision, changes):
+            return session, session.edit(revision, changes)
+
+        for seed in range(5):
+            self.run_edits(open_session, edit_session, seed)
+
+    def shared_cache(self):
+        # Only Redis passes get_shared_cache, so a private locmem cache stands in for it;
+        # it pickles every session like Redis does
+        return mock.patch.object(DocumentSessionService, '_get_cache', return_value=caches['sessions'])
+
+    @override_settings(CACHES=SESSION_CACHES)
+    def test_random_edits_through_shared_cache(self):
+        # Every edit rebuilds the session from the cache, as a different worker would
+        with self.shared_cache():
+            service = DocumentSessionService()
+
+            def open_session(text):
+                return service.create('en_US', text, owner_id=7)
+
+            def edit_session(session, revision, changes):
+                edited = service.edit(session.document_id, 7, revision, changes)
+                self.assertIsNotNone(edited)
+                self.assertIsNot(edited[0], session)
+                return edited
+
+            self.run_edits(open_session, edit_session, seed=100, rounds=60)
+
+    @override_settings(CACHES=SESSION_CACHES)
+    def test_other_owner_cannot_edit(self):
+        with self.shared_cache():
+            service = DocumentSessionService()
+            session = service.create('en_US', 'teh dog', owner_id=1)
+            self.assertIsNone(service.edit(session.document_id, 2, 1, []))
+            self.assertIsNone(service.get(session.document_id, 2))
+            self.assertEqual(service.get(session.document_id, 1).text, 'teh dog')
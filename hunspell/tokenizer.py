@@ -0,0 +1,87 @@
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _combining_marks_class():
+    """
+    Regex character class body covering every Unicode combining mark (Mn, Mc, Me),
+    which Python's ``\\w`` does not match but many scripts need inside words
+    """
+    ranges = []
+    start = None
+    for codepoint in range(sys.maxunicode + 1):
+        is_mark = unicodedata.category(chr(codepoint)).startswith('M')
+        if is_mark and start is None:
+            start = codepoint
+        elif not is_mark and start is not None:
+            ranges.append((start, codepoint - 1))
+            start = None
+    if start is not None:
+        ranges.append((start, sys.maxunicode))
+    return ''.join(
+        re.escape(chr(first)) if first == last else f"{re.escape(chr(first))}-{re.escape(chr(last))}"
+        for first, last in ranges
+    )
+
+
+class Tokenizer:
+    """
+    Splits raw text into words the way the language's .aff file defines them.
+
+    Letters and combining marks always belong to words, as do ``WORDCHARS`` and
+    the non-letter characters of ``TRY`` (apostrophes, hyphens, digits, dots...).
+    Punctuation among those is trimmed from the ends of a word, so "l'homme" and
+    "e-mail" stay whole while quotes and sentence-final dots are dropped. Tokens
+    without any letter are skipped.
+    """
+
+    def __init__(self, aff):
+        extra_chars = set(aff.WORDCHARS or '')
+        extra_chars.update(ch for ch in (aff.TRY or '') if not ch.isalpha())
+        self.extra_chars = ''.join(sorted(ch for ch in extra_chars if not ch.isspace()))
+        # Only punctuation/symbols are trimmed; digits and marks listed in WORDCHARS stay part of words
+        self.trim_chars = frozenset(
+            ch for ch in self.extra_chars if unicodedata.category(ch)[0] in 'PSZ'
+        )
+
+        word_class = r'[^\W\d_]' + f'|[{_combining_marks_class()}]'
+        if self.extra_chars:
+            word_class += f'|[{re.escape(self.extra_chars)}]'
+        self.word_regexp = re.compile(f'(?:{word_class})+')
+
+    def tokenize(self, text):
+        """
+        Args:
+            text: Raw document text
+
+        Yields:
+            tuple: (word, start, end) with ``start``/``end`` as code point offsets into ``text``
+        """
+        for match in self.word_regexp.finditer(text):
+            start, end = match.span()
+            while start < end and text[start] in self.trim_chars:
+                start += 1
+            while end > start and text[end - 1] in self.trim_chars:
+                end -= 1
+            word = text[start:end]
+            if word and any(ch.isalpha() for ch in word):
+                yield word, start, end
+
+
+def utf16_offsets(text):
+    """
+    Map code point offsets to UTF-16 code unit offsets (what JavaScript strings use)
+
+    Returns:
+        callable: offset -> UTF-16 offset
+    """
+    if text.isascii() or all(ord(ch) <= 0xFFFF for ch in text):
+        return lambda offset: offset
+
+    prefix = [0]
+    for ch in text:
+        prefix.append(prefix[-1] + (2 if ord(ch) > 0xFFFF else 1))
+    return prefix.__getitem__
@@ -1,18 +1,33 @@
 from django.urls import path
-from .views import SpellCheckerView, SpellCorrectionView, PersonalStarlistView, PersonalDictionaryView, WordReplacementView, AllWordReplacementsView
+from .async_views import async_check_spelling, async_suggest_corrections
+from .views import SpellCheckerView, DocumentCheckView, DocumentSessionView, DocumentSessionDetailView, DocumentEditView, SpellCorrectionView, PersonalStarlistView, PersonalDictionaryView, PersonalStarlistBulkView, PersonalDictionaryBulkView, WordReplacementView, AllWordReplacementsView, ReplacementAnalyticsView, RequestProfilesView, RequestProfileDownloadView, RequestProfileReportView
 
 urlpatterns = [
     path('api/check/', SpellCheckerView.as_view(), name='check_spelling'),
+    path('api/check-text/', DocumentCheckView.as_view(), name='check_document'),
+    path('api/documents/', DocumentSessionView.as_view(), name='open_document'),
+    path('api/documents/<str:document_id>/', DocumentSessionDetailView.as_view(), name='document_detail'),
+    path('api/documents/<str:document_id>/edits/', DocumentEditView.as_view(), name='edit_document'),
     path('api/get-list/', SpellCorrectionView.as_view(), name='suggest_corrections'),
+    path('api/async/check/', async_check_spelling, name='async_check_spelling'),
+    path('api/async/get-list/', async_suggest_corrections, name='async_suggest_corrections'),
     path('api/star-list/add/', PersonalStarlistView.as_view(), name='add_to_starlist'),
     path('api/star-list/remove/', PersonalStarlistView.as_view(), name='remove_from_starlist'),
+    path('api/star-list/bulk-add/', PersonalStarlistBulkView.as_view(), name='bulk_add_to_starlist'),
+    path('api/star-list/bulk-remove/', PersonalStarlistBulkView.as_view(), name='bulk_remove_from_starlist'),
     path('api/star-list/words/', PersonalStarlistView.as_view(), name='get_starlist_words'),
     path('api/star-list/languages/', PersonalStarlistView.as_view(), name='get_starlist_languages'),
     path('api/dictionary/add/', PersonalDictionaryView.as_view(), name='add_to_dictionary'),
     path('api/dictionary/remove/', PersonalDictionaryView.as_view(), name='remove_from_dictionary'),
+    path('api/dictionary/bulk-add/', PersonalDictionaryBulkView.as_view(), name='bulk_add_to_dictionary'),
+    path('api/dictionary/bulk-remove/', PersonalDictionaryBulkView.as_view(), name='bulk_remove_from_dictionary'),
     path('api/dictionary/words/', PersonalDictionaryView.as_view(), name='get_dictionary_words'),
     path('api/dictionary/languages/', PersonalDictionaryView.as_view(), name='get_dictionary_languages'),
     path('api/replacements/', WordReplacementView.as_view(), name='word-replacements'),
     path('data/replacements/', AllWordReplacementsView.as_view(), name='all-word-replacements'),
+    path('data/replacements/analytics/', ReplacementAnalyticsView.as_view(), name='word-replacement-analytics'),
+    path('data/profiles/', RequestProfilesView.as_view(), name='request-profiles'),
+    path('data/profiles/top-functions/', RequestProfileReportView.as_view(), name='request-profile-report'),
+    path('data/profiles/<str:profile_id>/', RequestProfileDownloadView.as_view(), name='request-profile-download'),
 ]
 
@@ -5,12 +5,53 @@ from rest_framework.exceptions import ValidationError as DRFValidationError
 from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from .services.personal_starlist_service import PersonalStarlistService
-from .services.personal_dictionary_service import PersonalDictionaryService
+from .services.personal_dictionary_service import PersonalDictionaryService, InvalidCursor
 from .services.spell_check_service import spell_checker_service
+from .services.personal_word_overlay_service import personal_word_overlay
+from .services.personal_words_version_service import personal_words_versions
+from .services.replacement_buffer_service import replacement_buffer
+from .services.replacement_rollup_service import ReplacementRollupService
+from .services.document_session_service import document_session_service, RevisionMismatch, DocumentTooLarge, DocumentBusy
+from .services.request_profile_service import request_profiles
+from .metrics import REQUEST_WORDS
 from .models import WordReplacement
+from .permissions import IsAdminEmail
+from .tokenizer import utf16_offsets
+from abc import ABC, abstractmethod
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_date
+from django.utils.http import parse_etags
 from rest_framework_simplejwt.authentication import JWTAuthentication
+import csv
+import io
+import json
 import os
 
+def serving_asgi(request):
+    """
+    Returns:
+        bool: Whether the request came in through ASGI, where streaming responses must be
+              async iterators (Django would otherwise read a sync one to the end before sending it)
+    """
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+async def iterate_in_thread(iterator, thread_sensitive=False):
+    """
+    Async iterator over a blocking one, advancing it in a worker thread so the event loop
+    keeps serving other requests. Use thread_sensitive=True when the iterator queries the database.
+    """
+    next_item = sync_to_async(next, thread_sensitive=thread_sensitive)
+    done = object()
+    while True:
+        item = await next_item(iterator, done)
+        if item is done:
+            return
+        yield item
+
 class SpellCheckerView(APIView):
     def post(self, request):
         words = request.data.get('words')
@@ -22,14 +63,17 @@ class SpellCheckerView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        REQUEST_WORDS.labels('check').observe(len(words))
         spell_checker = spell_checker_service.get_spell_checker(language)
-        results = []
-        for word in words:
-            is_correct = spell_checker.check_text(word)
-            results.append({
+        personal_words = personal_word_overlay.get_words(request.user, language)
+        # Repeated words (common in pasted documents) are only checked once
+        results = [
+            {
                 "word": word,
                 "is_correct": is_correct
-            })
+            }
+            for word, is_correct in zip(words, spell_checker.check_many(words, personal_words))
+        ]
         
         return Response(
             {
@@ -39,36 +83,323 @@ class SpellCheckerView(APIView):
             status=status.HTTP_200_OK
         )
 
-class SpellCorrectionView(APIView):
+class DocumentCheckView(APIView):
     def post(self, request):
-        words = request.data.get('words')
+        text = request.data.get('text')
         language = request.data.get('language', 'en_US')
+        offset_encoding = request.data.get('offset_encoding', 'codepoint')
         
-        if not words or not isinstance(words, list):
+        if not isinstance(text, str):
             return Response(
-                {"error": "A list of words is required"},
+                {"error": "A text string is required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if offset_encoding not in ('codepoint', 'utf-16'):
+            return Response(
+                {"error": "offset_encoding must be 'codepoint' or 'utf-16'"},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        max_length = getattr(settings, 'SPELLCHECK_MAX_TEXT_LENGTH', 1000000)
+        if len(text) > max_length:
+            return Response(
+                {"error": f"Text is longer than {max_length} characters"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        
         spell_checker = spell_checker_service.get_spell_checker(language)
-        suggestions = {}
-        for word in words:
-            word_suggestions = spell_checker.get_suggestions(word)
-            filtered_suggestions = [s for s in word_suggestions if s != word]
-            suggestions[word] = filtered_suggestions if filtered_suggestions else []
+        personal_words = personal_word_overlay.get_words(request.user, language)
+        misspelled, word_count = spell_checker.find_misspellings(text, personal_words)
+        REQUEST_WORDS.labels('check_text').observe(word_count)
+        
+        # JavaScript strings index by UTF-16 code units, which differ from code points past U+FFFF
+        to_offset = utf16_offsets(text) if offset_encoding == 'utf-16' else (lambda offset: offset)
+        misspellings = []
+        for word, start, end in misspelled:
+            offset = to_offset(start)
+            misspellings.append({
+                "word": word,
+                "offset": offset,
+                "length": to_offset(end) - offset
+            })
         
         return Response(
             {
-                "suggestions": suggestions,
+                "misspellings": misspellings,
+                "word_count": word_count,
+                "offset_encoding": offset_encoding,
                 "language": language
             },
             status=status.HTTP_200_OK
         )
 
-class PersonalStarlistView(APIView):
-    permission_classes = [IsAuthenticated]
+def _format_misspellings(misspelled):
+    return [
+        {"word": word, "offset": start, "length": end - start}
+        for word, start, end in misspelled
+    ]
+
+class DocumentSessionView(APIView):
+    """
+    Incremental checking over HTTP: open a session with the full text once, then send
+    only edits to DocumentEditView. Offsets are code points.
+    """
+    def post(self, request):
+        text = request.data.get('text')
+        language = request.data.get('language', 'en_US')
+        revision = request.data.get('revision', 0)
+        
+        if not isinstance(text, str) or not isinstance(revision, int):
+            return Response(
+                {"error": "A text string and an integer revision are required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        max_length = getattr(settings, 'SPELLCHECK_MAX_TEXT_LENGTH', 1000000)
+        if len(text) > max_length:
+            return Response(
+                {"error": f"Text is longer than {max_length} characters"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        
+        session = document_session_service.create(language, text, revision, _owner_id(request))
+        return Response(
+            {
+                "document_id": session.document_id,
+                "revision": session.revision,
+                "misspellings": _format_misspellings(session.misspellings),
+                "language": language
+            },
+            status=status.HTTP_201_CREATED
+        )
+
+class DocumentSessionDetailView(APIView):
+    def get(self, request, document_id):
+        session = document_session_service.get(document_id, _owner_id(request))
+        if session is None:
+            return _unknown_document_response()
+        
+        revision, misspelled = session.results()
+        return Response({
+            "document_id": session.document_id,
+            "revision": revision,
+            "misspellings": _format_misspellings(misspelled),
+            "language": session.language
+        })
+    
+    def delete(self, request, document_id):
+        if not document_session_service.close(document_id, _owner_id(request)):
+            return _unknown_document_response()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class DocumentEditView(APIView):
+    def post(self, request, document_id):
+        revision = request.data.get('revision')
+        changes = request.data.get('changes')
+        
+        if not isinstance(revision, int) or not isinstance(changes, list):
+            return Response(
+                {"error": "An integer revision and a list of changes are required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            edited = document_session_service.edit(document_id, _owner_id(request), revision, changes)
+        except RevisionMismatch as e:
+            return Response(
+                {"error": str(e.detail[0]), "expected_revision": e.expected_revision},
+                status=status.HTTP_409_CONFLICT
+            )
+        except DocumentTooLarge as e:
+            return Response(
+                {"error": str(e.detail[0])},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        except DRFValidationError as e:
+            return Response(
+                {"error": str(e.detail[0])},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except DocumentBusy as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"}
+            )
+        
+        if edited is None:
+            return _unknown_document_response()
+        session, (start, end, misspelled) = edited
+        
+        # Misspellings replace whatever the client had marked inside [start, end)
+        return Response({
+            "document_id": session.document_id,
+            "revision": revision,
+            "start": start,
+            "end": end,
+            "misspellings": _format_misspellings(misspelled)
+        })
+
+def _owner_id(request):
+    return request.user.id if request.user.is_authenticated else None
+
+def _unknown_document_response():
+    # Sessions expire (or were dropped by the cache); the client should open a new one
+    return Response(
+        {"error": "Unknown or expired document, open it again"},
+        status=status.HTTP_404_NOT_FOUND
+    )
+
+class SpellCorrectionView(APIView):
+    def post(self, request):
+        words = request.data.get('words')
+        language = request.data.get('language', 'en_US')
+        
+        if not words or not isinstance(words, list):
+            return Response(
+                {"error": "A list of words is required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        REQUEST_WORDS.labels('suggest').observe(len(words))
+        
+        # Words in the user's personal dictionary are correct, so they skip the expensive suggest step
+        personal_words = personal_word_overlay.get_words(request.user, language)
+        skipped_words = [word for word in words if personal_word_overlay.contains(personal_words, word)]
+        if skipped_words:
+            words = [word for word in words if not personal_word_overlay.contains(personal_words, word)]
+        
+        # Replacements other users chose are answered first; "more" asks for the full dictionary suggestions
+        use_history = not request.data.get('more')
+        
+        if request.data.get('stream') or 'application/x-ndjson' in request.headers.get('Accept', ''):
+            return self.stream_suggestions(request, words, language, skipped_words, use_history)
+        
+        # Goes through the service so results land in the suggestion cache (shared across workers with Redis),
+        # and are computed in the suggestion process pool when it is enabled
+        word_suggestions, pending_words = spell_checker_service.get_suggestions_many(
+            words, language, use_history=use_history
+        )
+        suggestions = {word: [] for word in skipped_words}
+        for word, candidates in word_suggestions.items():
+            filtered_suggestions = [s for s in candidates if s != word]
+            suggestions[word] = filtered_suggestions if filtered_suggestions else []
+        
+        response_data = {
+            "suggestions": suggestions,
+            "language": language,
+            "incomplete": bool(pending_words)
+        }
+        if pending_words:
+            # Words that ran past the request deadline; the client may ask for them again
+            response_data["pending_words"] = pending_words
+        
+        return Response(response_data, status=status.HTTP_200_OK)
+
+    def stream_suggestions(self, request, words, language, skipped_words=(), use_history=True):
+        """
+        Newline-delimited JSON: one {"word", "suggestions"} line per word as soon as it is
+        computed (cached and cheap words first), then a final {"done": true, ...} summary line.
+        Under ASGI the suggestions are computed in a worker thread, one line at a time.
+        """
+        def lines():
+            for word in skipped_words:
+                yield json.dumps({"word": word, "suggestions": []}) + "\n"
+            
+            pending_words = []
+            for word, candidates in spell_checker_service.iter_suggestions(words, language, use_history=use_history):
+                if candidates is None:
+                    pending_words.append(word)
+                    continue
+                filtered_suggestions = [s for s in candidates if s != word]
+                yield json.dumps({"word": word, "suggestions": filtered_suggestions}) + "\n"
+            
+            summary = {"done": True, "language": language, "incomplete": bool(pending_words)}
+            if pending_words:
+                summary["pending_words"] = pending_words
+            yield json.dumps(summary) + "\n"
+        
+        content = iterate_in_thread(lines()) if serving_asgi(request) else lines()
+        response = StreamingHttpResponse(content, content_type='application/x-ndjson')
+        # Keep reverse proxies from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+def _page_params(request):
+    """
+    Returns:
+        tuple: (cursor, limit, error response or None) from the ``cursor``/``limit`` query parameters
+    """
+    cursor = request.query_params.get('cursor') or None
+    limit = request.query_params.get('limit')
+    if limit is None:
+        return cursor, None, None
+    
+    max_limit = getattr(settings, 'PERSONAL_WORDS_PAGE_MAX', 5000)
+    try:
+        limit = int(limit)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= max_limit:
+        return None, None, Response(
+            {"error": f"limit must be between 1 and {max_limit}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return cursor, limit, None
+
+class WordListETagMixin(ABC):
+    """
+    Conditional GETs for a user's word lists: responses carry an ETag built from the
+    list's version counter, and a matching If-None-Match is answered with 304 before
+    any word rows are read. Views set ``word_type`` and implement ``list_words``.
+    """
+    word_type = None
+    
+    @abstractmethod
+    def list_words(self, request):
+        """
+        Build the uncached response for a GET, reading the word rows
+        
+        Args:
+            request: The GET request, for the user's languages ('languages' in the path)
+                     or one language's words (``?language=``)
+        
+        Returns:
+            Response: The list; an ETag is added to it when it has status 200
+        """
     
     def get(self, request):
+        if 'languages' in request.path:
+            language = None
+        else:
+            language = request.query_params.get('language')
+            if not language:
+                return self.list_words(request)
+        
+        version = personal_words_versions.get(request.user.id, language, self.word_type)
+        if version is None:
+            return self.list_words(request)
+        
+        etag = f'"{self.word_type}-{version}"'
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        
+        # The version was read before the rows, so a write in between only makes the ETag older
+        response = self.list_words(request)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            # Browsers keep the list but revalidate it on every use
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+class PersonalStarlistView(WordListETagMixin, APIView):
+    word_type = 'starlist'
+    permission_classes = [IsAuthenticated]
+    
+    def list_words(self, request):
         language = request.query_params.get('language')
         
         if 'languages' in request.path:
@@ -81,9 +412,18 @@ class PersonalStarlistView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
+        cursor, limit, error = _page_params(request)
+        if error:
+            return error
+        
         try:
-            words = PersonalStarlistService.get_user_starlist(request.user, language)
-            return Response({"words": list(words)})
+            words, next_cursor = PersonalStarlistService.get_user_starlist(request.user, language, cursor, limit)
+            return Response({"words": words, "next_cursor": next_cursor})
+        except InvalidCursor as e:
+            return Response(
+                {"error": str(e.detail[0])},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except (DjangoValidationError, DRFValidationError) as e:
             error_message = str(e.detail[0]) if hasattr(e, 'detail') else str(e)
             return Response(
@@ -161,10 +501,11 @@ class PersonalStarlistView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-class PersonalDictionaryView(APIView):
+class PersonalDictionaryView(WordListETagMixin, APIView):
+    word_type = 'dictionary'
     permission_classes = [IsAuthenticated]
     
-    def get(self, request):
+    def list_words(self, request):
         language = request.query_params.get('language')
         
         if 'languages' in request.path:
@@ -177,9 +518,18 @@ class PersonalDictionaryView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
+        cursor, limit, error = _page_params(request)
+        if error:
+            return error
+        
         try:
-            words = PersonalDictionaryService.get_user_dictionary(request.user, language)
-            return Response({"words": list(words)})
+            words, next_cursor = PersonalDictionaryService.get_user_dictionary(request.user, language, cursor, limit)
+            return Response({"words": words, "next_cursor": next_cursor})
+        except InvalidCursor as e:
+            return Response(
+                {"error": str(e.detail[0])},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except (DjangoValidationError, DRFValidationError) as e:
             error_message = str(e.detail[0]) if hasattr(e, 'detail') else str(e)
             return Response(
@@ -257,6 +607,55 @@ class PersonalDictionaryView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+class PersonalWordsBulkView(APIView):
+    """
+    Add or remove a whole list of words in one request (e.g. when importing a custom
+    dictionary), reporting what happened to each word
+    """
+    permission_classes = [IsAuthenticated]
+    service = None
+    
+    def post(self, request):
+        words = request.data.get('words')
+        language = request.data.get('language', 'en_US')
+        
+        if not words or not isinstance(words, list):
+            return Response(
+                {"error": "A list of words is required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            if 'remove' in request.path:
+                outcome = self.service.remove_words(request.user, words, language)
+            else:
+                outcome = self.service.add_words(request.user, words, language)
+        except (DjangoValidationError, DRFValidationError) as e:
+            error_message = str(e.detail[0]) if hasattr(e, 'detail') else str(e)
+            return Response(
+                {"error": error_message},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {"error": f"An unexpected error occurred: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        return Response(
+            {
+                **outcome,
+                "language": language
+            },
+            status=status.HTTP_200_OK
+        )
+
+class PersonalStarlistBulkView(PersonalWordsBulkView):
+    service = PersonalStarlistService
+
+class PersonalDictionaryBulkView(PersonalWordsBulkView):
+    service = PersonalDictionaryService
+
 class WordReplacementView(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = []  # Allow anonymous access for POST
@@ -296,6 +695,15 @@ class WordReplacementView(APIView):
                 {"error": "Both original_word and replacement_word are required"},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        
+        # Checked up front so a bad row can't fail a whole buffered batch later
+        for field_name, value in (('original_word', original_word), ('replacement_word', replacement_word), ('lang_code', language)):
+            max_length = WordReplacement._meta.get_field(field_name).max_length
+            if not isinstance(value, str) or len(value) > max_length:
+                return Response(
+                    {"error": f"{field_name} must be a string of at most {max_length} characters"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             
         try:
             replacement_data = {
@@ -306,9 +714,13 @@ class WordReplacementView(APIView):
             
             # Add user if authenticated
             if request.user.is_authenticated:
-                replacement_data['user'] = request.user
+                replacement_data['user_id'] = request.user.id
             
-            WordReplacement.objects.create(**replacement_data)
+            if replacement_buffer.enabled():
+                # Written in batches by the worker's background flusher
+                replacement_buffer.add(**replacement_data)
+            else:
+                WordReplacement.objects.create(**replacement_data)
             
             return Response({
                 "message": "Word replacement recorded successfully",
@@ -325,8 +737,16 @@ class WordReplacementView(APIView):
             )
 
 class AllWordReplacementsView(APIView):
+    """
+    All recorded replacements, newest first. JSON responses are one page at a time
+    (keyset pagination on id, ``?cursor=<next_cursor>&limit=``; ``?count=true`` adds
+    the exact total); ``?export=csv`` or ``?export=ndjson`` streams every row instead.
+    Both read rows in chunks, so memory use doesn't grow with the table.
+    """
     permission_classes = [IsAuthenticated]
     
+    EXPORT_FIELDS = ['id', 'original_word', 'replacement_word', 'lang_code', 'created_at', 'user__username']
+    
     def get(self, request):
         admin_emails = os.getenv('ADMIN_EMAIL', '').split(',')
         if request.user.email not in admin_emails:
@@ -342,17 +762,222 @@ class AllWordReplacementsView(APIView):
         # Apply filters if provided
         if language:
             queryset = queryset.filter(lang_code=language)
-            
-            
-        replacements = queryset.values(
-            'original_word',
-            'replacement_word',
-            'lang_code',
-            'created_at',
-            'user__username'  # Include username if available
-        ).order_by('-created_at')
+        
+        export = request.query_params.get('export')
+        if export:
+            if export not in ('csv', 'ndjson'):
+                return Response(
+                    {"error": "export must be 'csv' or 'ndjson'"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return self.stream_export(request, queryset, export)
+        
+        cursor = request.query_params.get('cursor')
+        max_limit = getattr(settings, 'REPLACEMENTS_PAGE_MAX', 10000)
+        try:
+            limit = int(request.query_params.get('limit', getattr(settings, 'REPLACEMENTS_PAGE_SIZE', 1000)))
+            cursor = int(cursor) if cursor else None
+        except ValueError:
+            return Response(
+                {"error": "cursor and limit must be integers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not 1 <= limit <= max_limit:
+            return Response(
+                {"error": f"limit must be between 1 and {max_limit}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        page = queryset
+        if cursor is not None:
+            page = page.filter(id__lt=cursor)
+        # Ids grow with created_at, so newest first is a walk down the primary key index
+        replacements = list(page.values(*self.EXPORT_FIELDS).order_by('-id')[:limit + 1])
+        next_cursor = None
+        if len(replacements) > limit:
+            replacements = replacements[:limit]
+            next_cursor = str(replacements[-1]['id'])
+        
+        response_data = {
+            "replacements": replacements,
+            "next_cursor": next_cursor
+        }
+        # An exact count scans the whole table, so it is only computed on request
+        if request.query_params.get('count') in ('1', 'true', 'True'):
+            response_data["count"] = queryset.count()
+        return Response(response_data)
+    
+    def stream_export(self, request, queryset, export):
+        """
+        Stream every row of the queryset as CSV or NDJSON, one database round trip of
+        REPLACEMENTS_EXPORT_CHUNK_SIZE rows (walking down the id like the JSON pages) per chunk
+        sent. Under ASGI the rows are fetched in Django's database thread between chunks.
+        """
+        chunk_size = getattr(settings, 'REPLACEMENTS_EXPORT_CHUNK_SIZE', 2000)
+        created_at_index = self.EXPORT_FIELDS.index('created_at')
+        
+        def fetch_rows(before_id):
+            page = queryset if before_id is None else queryset.filter(id__lt=before_id)
+            return list(page.values_list(*self.EXPORT_FIELDS).order_by('-id')[:chunk_size])
+        
+        def ndjson_lines(rows):
+            lines = []
+            for row in rows:
+                record = dict(zip(self.EXPORT_FIELDS, row))
+                record['created_at'] = record['created_at'].isoformat()
+                lines.append(json.dumps(record) + "\n")
+            return ''.join(lines)
+        
+        def csv_lines(rows):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                row = list(row)
+                row[created_at_index] = row[created_at_index].isoformat()
+                writer.writerow(row)
+            return buffer.getvalue()
+        
+        render = csv_lines if export == 'csv' else ndjson_lines
+        
+        def chunks():
+            if export == 'csv':
+                buffer = io.StringIO()
+                csv.writer(buffer).writerow(self.EXPORT_FIELDS)
+                yield buffer.getvalue()
+            rows = fetch_rows(None)
+            while rows:
+                yield render(rows)
+                rows = fetch_rows(rows[-1][0]) if len(rows) == chunk_size else []
+        
+        content = iterate_in_thread(chunks(), thread_sensitive=True) if serving_asgi(request) else chunks()
+        if export == 'csv':
+            response = StreamingHttpResponse(content, content_type='text/csv; charset=utf-8')
+            response['Content-Disposition'] = 'attachment; filename="word_replacements.csv"'
+        else:
+            response = StreamingHttpResponse(content, content_type='application/x-ndjson')
+        # Keep reverse proxies from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+class ReplacementAnalyticsView(APIView):
+    """
+    Most frequent typos per language and day range, read from the daily rollup
+    (see the rollup_word_replacements command) instead of scanning raw replacements
+    """
+    permission_classes = [IsAuthenticated, IsAdminEmail]
+    
+    def get(self, request):
+        language = request.query_params.get('language')
+        group_by = request.query_params.get('group_by', 'pair')
+        start = request.query_params.get('start')
+        end = request.query_params.get('end')
+        
+        if group_by not in ('pair', 'word', 'day'):
+            return Response(
+                {"error": "group_by must be 'pair', 'word' or 'day'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            limit = int(request.query_params.get('limit', 50))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= 1000:
+            return Response(
+                {"error": "limit must be between 1 and 1000"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            start = parse_date(start) if start else None
+            end = parse_date(end) if end else None
+        except ValueError:
+            start = end = None
+        if (request.query_params.get('start') and start is None) or (request.query_params.get('end') and end is None):
+            return Response(
+                {"error": "start and end must be YYYY-MM-DD dates"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        results = ReplacementRollupService.top_replacements(language, start, end, group_by, limit)
+        watermark = ReplacementRollupService.get_watermark()
         
         return Response({
-            "count": queryset.count(),
-            "replacements": list(replacements)
+            "results": results,
+            "language": language,
+            "group_by": group_by,
+            # Rows newer than this aren't counted yet
+            "rolled_up_to": {
+                "last_id": watermark.last_id,
+                "updated_at": watermark.updated_at
+            } if watermark else None
+        })
+
+class RequestProfilesView(APIView):
+    """
+    Profiles of check/suggestion requests captured with ``X-Profile: 1`` (see
+    RequestProfilingMiddleware), newest first, optionally for one ``?language=``/``?view=``
+    """
+    permission_classes = [IsAuthenticated, IsAdminEmail]
+    
+    def get(self, request):
+        profiles = request_profiles.list_profiles(
+            request.query_params.get('language'),
+            request.query_params.get('view')
+        )
+        return Response({"profiles": profiles})
+
+class RequestProfileDownloadView(APIView):
+    """
+    One stored profile as a pstats file (``python -m pstats <file>``, snakeviz...)
+    """
+    permission_classes = [IsAuthenticated, IsAdminEmail]
+    
+    def get(self, request, profile_id):
+        path = request_profiles.get_path(profile_id)
+        if path is None:
+            return Response(
+                {"error": "Profile not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return FileResponse(
+            open(path, 'rb'),
+            as_attachment=True,
+            filename=path.name,
+            content_type='application/octet-stream'
+        )
+
+class RequestProfileReportView(APIView):
+    """
+    Functions that took the most time across the stored profiles of a language,
+    e.g. ``?language=hu_HU&view=suggest&sort=cumtime&limit=30``
+    """
+    permission_classes = [IsAuthenticated, IsAdminEmail]
+    
+    def get(self, request):
+        language = request.query_params.get('language')
+        view_name = request.query_params.get('view')
+        sort = request.query_params.get('sort', 'tottime')
+        if sort not in ('tottime', 'cumtime'):
+            return Response(
+                {"error": "sort must be 'tottime' or 'cumtime'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            limit = int(request.query_params.get('limit', 30))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= 500:
+            return Response(
+                {"error": "limit must be between 1 and 500"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        report = request_profiles.top_functions(language, view_name, sort, limit)
+        return Response({
+            **report,
+            "language": language,
+            "view": view_name,
+            "sort": sort
         })
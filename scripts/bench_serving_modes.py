@@ -0,0 +1,220 @@
+"""
+Compare the sync gthread setup with the async ASGI (uvicorn worker) setup.
+
+For each mode this starts gunicorn with gunicorn.conf.py, opens a number of idle
+keep-alive connections (editors that are open but not typing), and then measures
+latency and throughput of spell-check requests sent by a smaller set of active
+clients while the idle connections are held.
+
+Usage (from the repository root):
+    python scripts/bench_serving_modes.py --idle 2000 --active 32 --requests 2000
+    python scripts/bench_serving_modes.py --modes asgi --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODES = {
+    'gthread': {
+        'app': 'core.wsgi:application',
+        'worker_class': 'gthread',
+        'path': '/api/check/',
+    },
+    'asgi': {
+        'app': 'core.asgi:application',
+        'worker_class': 'uvicorn.workers.UvicornWorker',
+        'path': '/api/async/check/',
+    },
+}
+
+WORDS = ["the", "quick", "brown", "fox", "jumpd", "over", "teh", "lazy", "dgo", "recieve"]
+
+
+async def http_post(reader, writer, host, port, path, payload):
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"POST {path} HTTP/1.1\r\n"
+        f"Host: {host}:{port}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: keep-alive\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed by server")
+    status = int(status_line.split()[1])
+    content_length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            content_length = int(value.strip())
+    await reader.readexactly(content_length)
+    return status
+
+
+async def open_idle_connections(host, port, path, count):
+    connections = []
+    failed = 0
+    for _ in range(count):
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            await http_post(reader, writer, host, port, path, {"words": ["hello"], "language": "en_US"})
+            connections.append((reader, writer))
+        except (OSError, ConnectionError, asyncio.IncompleteReadError):
+            failed += 1
+    return connections, failed
+
+
+async def active_client(host, port, path, latencies, errors, remaining):
+    reader = writer = None
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            start = time.perf_counter()
+            status = await http_post(reader, writer, host, port, path, {"words": WORDS, "language": "en_US"})
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError) as e:
+            errors.append(type(e).__name__)
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def still_open(connections, host, port, path):
+    alive = 0
+    for reader, writer in connections:
+        try:
+            status = await asyncio.wait_for(
+                http_post(reader, writer, host, port, path, {"words": ["hello"], "language": "en_US"}),
+                timeout=10
+            )
+            alive += status == 200
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        writer.close()
+    return alive
+
+
+async def run_load(host, port, path, idle, active, requests, hold):
+    connections, idle_failed = await open_idle_connections(host, port, path, idle)
+
+    latencies, errors = [], []
+    remaining = [requests]
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        active_client(host, port, path, latencies, errors, remaining) for _ in range(active)
+    ))
+    elapsed = time.perf_counter() - start
+
+    await asyncio.sleep(hold)
+    idle_alive = await still_open(connections, host, port, path)
+
+    latencies.sort()
+
+    def percentile(p):
+        if not latencies:
+            return None
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+    return {
+        "idle_requested": idle,
+        "idle_opened": len(connections),
+        "idle_failed": idle_failed,
+        "idle_alive_after_hold": idle_alive,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "mean": round(statistics.mean(latencies) * 1000, 2) if latencies else None,
+        },
+    }
+
+
+def wait_until_ready(host, port, path, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async def probe():
+                reader, writer = await asyncio.open_connection(host, port)
+                try:
+                    return await http_post(reader, writer, host, port, path, {"words": ["hello"], "language": "en_US"})
+                finally:
+                    writer.close()
+            if asyncio.run(probe()) == 200:
+                return
+        except (OSError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server on port {port} did not become ready")
+
+
+def bench_mode(mode, args):
+    config = MODES[mode]
+    env = dict(os.environ, GUNICORN_WORKER_CLASS=config['worker_class'])
+    command = [
+        sys.executable, '-m', 'gunicorn',
+        '--config', 'gunicorn.conf.py',
+        '--workers', str(args.workers),
+        '--bind', f"{args.host}:{args.port}",
+        config['app'],
+    ]
+    server = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(args.host, args.port, config['path'])
+        result = asyncio.run(run_load(
+            args.host, args.port, config['path'], args.idle, args.active, args.requests, args.hold
+        ))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    result["mode"] = mode
+    result["workers"] = args.workers
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', choices=sorted(MODES), default=['gthread', 'asgi'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--idle', type=int, default=500, help='Idle keep-alive connections to hold open')
+    parser.add_argument('--active', type=int, default=16, help='Concurrent active clients')
+    parser.add_argument('--requests', type=int, default=1000, help='Total requests sent by active clients')
+    parser.add_argument('--hold', type=float, default=2.0, help='Seconds to wait before probing idle connections')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    results = [bench_mode(mode, args) for mode in args.modes]
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output)
+
+
+if __name__ == '__main__':
+    main()